@@ -0,0 +1,228 @@
+"""
+Сериализация страницы документов (15 и 50 элементов): DocumentListItem
+через model_validate(from_attributes) + jsonable_encoder + json.dumps
+против serialize_document_list_item + FastJSONResponse (pydantic-core).
+
+У каждого документа типичный набор связей: отправитель — внешний
+пользователь с организацией, пять получателей (четыре сотрудника и
+организация), основной файл и три приложения. Строки — простые объекты
+с атрибутами ORM, справочники — готовые модели, как из directory_cache.
+Регистрационный номер — объект RegistrationNumber с теми колонками,
+что грузит document_list_options(): full_name читает full_number.
+
+Черновой модуль написан под пути src.modules.*, поэтому на время замера
+его пакеты подключаются под этими именами (см. DraftFinder).
+
+    python -m benchmarks.bench_document_list_serialize
+"""
+
+import importlib.abc
+import importlib.util
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+DRAFT_PACKAGES = ("documents", "workflow", "registration")
+SIZES = (15, 50)
+
+
+class DraftFinder(importlib.abc.MetaPathFinder):
+    """src.modules.<package> -> src/draft/V3/<package>"""
+
+    def find_spec(self, name, path, target=None):
+        parts = name.split(".")
+        if parts[:2] != ["src", "modules"] or len(parts) < 3:
+            return None
+        if parts[2] not in DRAFT_PACKAGES:
+            return None
+        spec = importlib.util.find_spec(".".join(["src", "draft", "V3", *parts[2:]]))
+        if spec is None:
+            return None
+        return importlib.util.spec_from_file_location(
+            name,
+            spec.origin,
+            submodule_search_locations=spec.submodule_search_locations,
+        )
+
+
+sys.meta_path.insert(0, DraftFinder())
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from src.adapters.http.user_client import (  # noqa: E402
+    ExternalUser,
+    ExternalUserOrganization,
+    Organization,
+    User,
+)
+from src.common.pagination import make_page  # noqa: E402
+from src.common.responses import FastJSONResponse  # noqa: E402
+from src.modules.documents.enums import (  # noqa: E402
+    DocumentConfidentialTypeEnum,
+    DocumentPartyTypeEnum,
+    DocumentTypeEnum,
+)
+from src.modules.documents.schemas.document_list_item import (  # noqa: E402
+    DocumentListItem,
+)
+from src.modules.documents.serializers import (  # noqa: E402
+    serialize_document_list_item,
+)
+from src.modules.registration.models import RegistrationNumber  # noqa: E402
+
+NOW = datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc)
+OFFICIAL_USE_ONLY = (
+    DocumentConfidentialTypeEnum.DOCUMENT_PRIVACY_LEVEL_OFFICIAL_USE_ONLY
+)
+
+
+def make_user() -> User:
+    return User(
+        id=uuid.uuid4(),
+        status_text="",
+        department="Канцелярия",
+        email="user@example.com",
+        username="user",
+        full_name="Иванов Иван Иванович",
+        job_title="Специалист",
+        roles=["VSM_DOCFLOW_BASIC"],
+    )
+
+
+def make_organization() -> Organization:
+    return Organization(
+        id=uuid.uuid4(),
+        name='ООО "Ромашка"',
+        is_active=True,
+        inn_number="7701234567",
+        kpp_number="770101001",
+    )
+
+
+def make_external_user(organization: Organization) -> ExternalUser:
+    return ExternalUser(
+        id=uuid.uuid4(),
+        first_name="Пётр",
+        last_name="Петров",
+        is_active=True,
+        created_at=NOW,
+        role="CONTACT",
+        organizations=[
+            ExternalUserOrganization(id=organization.id, name=organization.name)
+        ],
+    )
+
+
+def party(party_type, user_id=None, organization_id=None, external_user_id=None):
+    return SimpleNamespace(
+        party_type=party_type,
+        user_id=user_id,
+        organization_id=organization_id,
+        external_user_id=external_user_id,
+    )
+
+
+def file(is_main: bool):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name="Письмо.pdf" if is_main else "Приложение.docx",
+        created_at=NOW,
+        size=245_760,
+        extension="pdf" if is_main else "docx",
+        is_main=is_main,
+    )
+
+
+def make_page_rows(size: int) -> tuple[list, dict]:
+    context = {"users": {}, "organizations": {}, "external_users": {}}
+
+    def remember(kind, entry):
+        context[kind][str(entry.id)] = entry
+        return entry.id
+
+    docs = []
+    for i in range(size):
+        organization = make_organization()
+        sender_org = remember("organizations", organization)
+        sender = remember("external_users", make_external_user(organization))
+        recipient_org = remember("organizations", make_organization())
+        recipients = [remember("users", make_user()) for _ in range(4)]
+        creator = remember("users", make_user())
+        # full_number вычисляет БД; здесь — то же значение, что после загрузки
+        registration_number = RegistrationNumber(
+            full_number=f"ВХ-{1000 + i}/25", registrator=creator, created_at=NOW
+        )
+        docs.append(
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                document_type=DocumentTypeEnum.INCOMING,
+                registration=SimpleNamespace(
+                    external_registration_number=f"{i}-исх",
+                    external_registration_at=NOW,
+                    registration_number=registration_number,
+                ),
+                address_parties=[
+                    party(
+                        DocumentPartyTypeEnum.SENDER,
+                        organization_id=sender_org,
+                        external_user_id=sender,
+                    ),
+                    *(
+                        party(DocumentPartyTypeEnum.RECIPIENT, user_id=user_id)
+                        for user_id in recipients
+                    ),
+                    party(
+                        DocumentPartyTypeEnum.RECIPIENT, organization_id=recipient_org
+                    ),
+                ],
+                content="О согласовании договора поставки оборудования " * 3,
+                created_at=NOW,
+                creator_id=creator,
+                paper_count=3,
+                attachment_description="3 приложения",
+                deadline=None,
+                confidentials=[SimpleNamespace(confidential=OFFICIAL_USE_ONLY)],
+                files=[file(True), file(False), file(False), file(False)],
+                document_status="WAITING",
+            )
+        )
+    return docs, context
+
+
+def before(docs, context) -> bytes:
+    items = [
+        DocumentListItem.model_validate(d, from_attributes=True, context=context)
+        for d in docs
+    ]
+    page = make_page(items, 1000, 1, len(docs))
+    return JSONResponse(jsonable_encoder(page)).body
+
+
+def after(docs, context) -> bytes:
+    items = [serialize_document_list_item(d, context) for d in docs]
+    return FastJSONResponse(make_page(items, 1000, 1, len(docs))).body
+
+
+def main():
+    print(f"{'items':>5} {'before, ms':>11} {'after, ms':>10} {'speedup':>8}")
+    for size in SIZES:
+        docs, context = make_page_rows(size)
+        assert json.loads(before(docs, context)) == json.loads(after(docs, context))
+        number = 200
+        timings = {}
+        for name, fn in (("before", before), ("after", after)):
+            best = min(timeit.repeat(lambda: fn(docs, context), number=number))
+            timings[name] = best / number * 1000
+        speedup = timings["before"] / timings["after"]
+        print(
+            f"{size:>5} {timings['before']:>11.2f} {timings['after']:>10.2f}"
+            f" {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Построение и компиляция запроса списка документов со статусом пользователя:
+выражение, собираемое заново на каждый вызов, против заранее построенного
+запроса с bind-параметрами.
+
+Черновые модели (src/draft/V3) не импортируются отдельно, поэтому таблицы
+повторены здесь в Core; выполнение идёт на пустой SQLite в памяти, чтобы
+замерить именно построение, cache key и компиляцию.
+
+    python -m benchmarks.bench_list_query_compile
+"""
+
+import timeit
+import uuid
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Uuid,
+    bindparam,
+    case,
+    create_engine,
+    event,
+    func,
+    select,
+)
+from sqlalchemy.engine.default import CACHE_HIT
+
+metadata = MetaData()
+document = Table(
+    "documents_document",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("creator_id", Uuid),
+    Column("content", String),
+    Column("created_at", DateTime),
+)
+workflow = Table(
+    "workflow_workflow",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("document_id", Uuid),
+)
+step = Table(
+    "workflow_workflow_step",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("workflow_id", Uuid),
+    Column("status", String),
+    Column("is_active", Boolean),
+    Column("started_at", DateTime),
+    Column("finished_at", DateTime),
+)
+participant = Table(
+    "workflow_workflow_participant_step",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("workflow_step_id", Uuid),
+    Column("user_id", Uuid),
+)
+
+
+def status_expression(user_id):
+    s, p, w = step.alias(), participant.alias(), workflow.alias()
+    participant_status = (
+        select(s.c.status)
+        .join(p, p.c.workflow_step_id == s.c.id)
+        .join(w, w.c.id == s.c.workflow_id)
+        .where(w.c.document_id == document.c.id)
+        .where(p.c.user_id == user_id)
+        .where(s.c.is_active.is_(True) | s.c.finished_at.isnot(None))
+        .order_by(s.c.started_at.desc().nullslast())
+        .limit(1)
+        .correlate(document)
+        .scalar_subquery()
+    )
+    creator_status = (
+        select(s.c.status)
+        .join(w, w.c.id == s.c.workflow_id)
+        .where(w.c.document_id == document.c.id)
+        .order_by(s.c.is_active.desc(), s.c.finished_at.desc().nullslast())
+        .limit(1)
+        .correlate(document)
+        .scalar_subquery()
+    )
+    return case(
+        (document.c.creator_id == user_id, creator_status),
+        else_=participant_status,
+    )
+
+
+def list_query(user_id, limit, offset):
+    return (
+        select(document, status_expression(user_id).label("document_status"))
+        .order_by(document.c.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+PREBUILT = list_query(
+    bindparam("current_user_id", type_=Uuid),
+    bindparam("limit", type_=Integer),
+    bindparam("offset", type_=Integer),
+)
+PREBUILT_COUNT = select(func.count()).select_from(PREBUILT.subquery())
+
+
+def main():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    hits = {"hit": 0, "total": 0}
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def count_hits(conn, cursor, statement, parameters, context, executemany):
+        hits["total"] += 1
+        hits["hit"] += context.cache_hit is CACHE_HIT
+
+    user_id = uuid.uuid4()
+    with engine.connect() as conn:
+        uncached = conn.execution_options(compiled_cache=None)
+
+        def before(c=conn):
+            q = list_query(user_id, 15, 30)
+            c.execute(select(func.count()).select_from(q.subquery())).scalar()
+            c.execute(q).all()
+
+        def after(c=conn):
+            params = {"current_user_id": user_id, "limit": 15, "offset": 30}
+            c.execute(PREBUILT_COUNT, params).scalar()
+            c.execute(PREBUILT, params).all()
+
+        rows = [
+            ("before, no cache", lambda: before(uncached)),
+            ("before", before),
+            ("after", after),
+        ]
+        print(f"{'variant':>17} {'us/call':>9} {'cache hits':>11}")
+        for name, fn in rows:
+            fn()
+            hits.update(hit=0, total=0)
+            number = 500
+            best = min(timeit.repeat(fn, number=number, repeat=5))
+            ratio = hits["hit"] / hits["total"]
+            print(f"{name:>17} {best / number * 1e6:>9.1f} {ratio:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Разбор ответа /event-users-info: response.json() + model_validate в цикле
+против TypeAdapter(list[User]).validate_json по сырым байтам.
+
+    python -m benchmarks.bench_user_decode
+"""
+
+import json
+import timeit
+import uuid
+
+from src.adapters.http.user_client import User, users_adapter
+
+SIZES = (10, 100, 1000)
+
+
+def make_payload(size: int) -> bytes:
+    return json.dumps(
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "avatar": None,
+                "status_text": "",
+                "department": "Канцелярия",
+                "email": f"user{i}@example.com",
+                "username": f"user{i}",
+                "full_name": "Иванов Иван Иванович",
+                "job_title": "Специалист",
+                "roles": ["VSM_DOCFLOW_BASIC", "VSM_DOCFLOW_REGISTRATOR"],
+            }
+            for i in range(size)
+        ]
+    ).encode()
+
+
+def decode_before(raw: bytes) -> dict[str, User]:
+    data = {}
+    if response_data := json.loads(raw):
+        for user in response_data:
+            user = User.model_validate(user)
+            data[str(user.id)] = user
+    return data
+
+
+def decode_after(raw: bytes) -> dict[str, User]:
+    data = {}
+    for user in users_adapter.validate_json(raw) or []:
+        data[str(user.id)] = user
+    return data
+
+
+def per_item_us(fn, raw: bytes, size: int) -> float:
+    number = max(10, 20000 // size)
+    best = min(timeit.repeat(lambda: fn(raw), number=number, repeat=5))
+    return best / number / size * 1e6
+
+
+def main():
+    print(f"{'users':>6} {'before, us/item':>16} {'after, us/item':>15} {'speedup':>8}")
+    for size in SIZES:
+        raw = make_payload(size)
+        assert decode_before(raw).keys() == decode_after(raw).keys()
+        before = per_item_us(decode_before, raw, size)
+        after = per_item_us(decode_after, raw, size)
+        print(f"{size:>6} {before:>16.2f} {after:>15.2f} {before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 from fastapi import FastAPI
 
 from src.core.events import lifespan
+from src.core.health import router as health_router
 from src.core.settings import get_settings
 from src.middlewares.auth_header_context import AuthHeaderContextMiddleware
+from src.middlewares.in_flight import InFlightMiddleware
+from src.middlewares.query_stats import QueryStatsMiddleware
 from src.modules.correspondence.api.router import router as documents_router
 
 app = FastAPI(
@@ -13,5 +16,8 @@ app = FastAPI(
 settings = get_settings()
 
 app.add_middleware(AuthHeaderContextMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(InFlightMiddleware)
 
+app.include_router(health_router)
 app.include_router(documents_router, prefix="/api-documents")
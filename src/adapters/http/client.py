@@ -1,34 +1,86 @@
 from __future__ import annotations
 
+from enum import StrEnum
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
 import httpx
 from src.core.settings import get_settings
 
-_http: httpx.AsyncClient | None = None
+
+class ExternalService(StrEnum):
+    """Внешние сервисы, у каждого свой клиент и пул соединений"""
+
+    USERS = "users"
+    FILES = "files"
 
 
-def get_http_client() -> httpx.AsyncClient:
+def _stateless_cookies() -> httpx.Cookies:
     """
-    Ленивая инициализация общего httpx.AsyncClient.
-    Повторные вызовы возвращают один и тот же клиент (общий пул соединений).
+    Cookie jar, который ничего не запоминает: учётные данные передаются
+    в каждом запросе и не должны утекать между запросами разных пользователей.
     """
-    global _http
-    if _http is None or _http.is_closed:
-        s = get_settings()
-        _http = httpx.AsyncClient(
+    return httpx.Cookies(CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])))
+
+
+class HttpClientRegistry:
+    """
+    Реестр httpx.AsyncClient: один клиент на внешний сервис
+    со своими лимитами соединений, keep-alive и (опционально) HTTP/2.
+    Создаётся на startup, закрывается на shutdown.
+    """
+
+    def __init__(self):
+        self._clients: dict[ExternalService, httpx.AsyncClient] = {}
+
+    def _create(self, service: ExternalService) -> httpx.AsyncClient:
+        s = get_settings().http_client
+        limits = getattr(s, service.value)
+        return httpx.AsyncClient(
             timeout=httpx.Timeout(
-                connect=s.http_client.CONNECT_TIMEOUT_S,
-                read=s.http_client.READ_TIMEOUT_S,
-                write=s.http_client.WRITE_TIMEOUT_S,
-                pool=s.http_client.POOL_LIMIT,
+                connect=s.CONNECT_TIMEOUT_S,
+                read=s.READ_TIMEOUT_S,
+                write=s.WRITE_TIMEOUT_S,
+                pool=s.POOL_TIMEOUT_S,
+            ),
+            limits=httpx.Limits(
+                max_connections=limits.MAX_CONNECTIONS,
+                max_keepalive_connections=limits.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=limits.KEEPALIVE_EXPIRY_S,
             ),
-            limits=httpx.Limits(max_connections=s.http_client.POOL_LIMIT),
+            http2=limits.HTTP2,
+            cookies=_stateless_cookies(),
         )
-    return _http
+
+    def get(self, service: ExternalService) -> httpx.AsyncClient:
+        client = self._clients.get(service)
+        if client is None or client.is_closed:
+            client = self._clients[service] = self._create(service)
+        return client
+
+    async def startup(self) -> None:
+        for service in ExternalService:
+            self.get(service)
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            if not client.is_closed:
+                await client.aclose()
+        self._clients.clear()
+
+
+http_clients = HttpClientRegistry()
+
+
+def get_http_client(
+    service: ExternalService = ExternalService.USERS,
+) -> httpx.AsyncClient:
+    """
+    Клиент внешнего сервиса из реестра.
+    Повторные вызовы возвращают один и тот же клиент (общий пул соединений).
+    """
+    return http_clients.get(service)
 
 
 async def aclose_http_client() -> None:
-    """Корректно закрыть клиент на shutdown."""
-    global _http
-    if _http and not _http.is_closed:
-        await _http.aclose()
-    _http = None
+    """Корректно закрыть клиенты на shutdown."""
+    await http_clients.aclose()
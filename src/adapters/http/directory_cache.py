@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Generic, Iterable, Type, TypeVar
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from src.adapters.http.user_client import (
+    UserClient,
+    User,
+    Organization,
+    ExternalUser,
+)
+from src.adapters.http.user_loader import user_directory_loader
+from src.adapters.redis.client import get_redis_client, cache_key
+from src.common.cache import LRUCache
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+LoadFn = Callable[[UserClient, Iterable], Awaitable[dict[str, M]]]
+
+
+@dataclass
+class CacheStats:
+    """Счётчики попаданий для подбора размера кэша"""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+
+
+class EntityCache(Generic[M]):
+    """
+    Кэш одного типа справочника.
+    L1 — LRU в процессе, L2 — Redis (общий для воркеров), далее пакетный загрузчик.
+    Устаревшая запись отдаётся сразу, а обновляется в фоне.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: Type[M],
+        load: LoadFn[M],
+        ttl_s: Callable[[], int],
+    ):
+        self.name = name
+        self.model = model
+        self._load = load
+        self._ttl_s = ttl_s
+        self._l1: LRUCache[str, M] = LRUCache(
+            get_settings().directory_cache.L1_MAX_ITEMS
+        )
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = CacheStats()
+
+    def _key(self, id_: str) -> str:
+        return cache_key("directory", self.name, id_)
+
+    async def get_many(self, client: UserClient, ids: Iterable) -> dict[str, M]:
+        keys = {str(i) for i in ids if i}
+        result: dict[str, M] = {}
+        stale: set[str] = set()
+
+        # L1
+        l2_keys = []
+        for key in keys:
+            entry = self._l1.get(key)
+            if entry is None:
+                l2_keys.append(key)
+                continue
+            result[key], is_stale = entry
+            if is_stale:
+                stale.add(key)
+            else:
+                self.stats.l1_hits += 1
+
+        # L2
+        missing = set(l2_keys)
+        if l2_keys:
+            for key, (value, age) in (await self._read_l2(l2_keys)).items():
+                result[key] = value
+                missing.discard(key)
+                self._remember_l1(key, value, age)
+                if age >= self._ttl_s():
+                    stale.add(key)
+                else:
+                    self.stats.l2_hits += 1
+
+        # Загрузчик
+        if missing:
+            self.stats.misses += len(missing)
+            loaded = await self._load(client, missing)
+            await self._store(loaded)
+            result.update(loaded)
+
+        if stale:
+            self.stats.stale_hits += len(stale)
+            self._schedule_refresh(client, stale)
+
+        return result
+
+    @property
+    def l1_size(self) -> int:
+        return len(self._l1)
+
+    def invalidate(self, id_: str) -> None:
+        self._l1.delete(str(id_))
+
+    def _remember_l1(self, key: str, value: M, age: float) -> None:
+        # срок в L1 отсчитывается от записи в L2, а не от чтения
+        s = get_settings().directory_cache
+        ttl = self._ttl_s()
+        fresh = max(ttl - age, 0)
+        stale = max(ttl + s.STALE_TTL_S - age, 0) - fresh
+        self._l1.set(key, value, ttl=fresh, stale_ttl=stale)
+
+    async def _read_l2(self, keys: list[str]) -> dict[str, tuple[M, float]]:
+        """(значение, возраст записи в секундах) для найденных ключей"""
+        try:
+            raw = await get_redis_client().mget([self._key(k) for k in keys])
+        except RedisError:
+            logger.warning("L2 кэш справочников недоступен", exc_info=True)
+            return {}
+
+        now = time.time()
+        found = {}
+        for key, item in zip(keys, raw):
+            if not item:
+                continue
+            payload = json.loads(item)
+            value = self.model.model_validate(payload["v"])
+            found[key] = (value, max(now - payload["t"], 0.0))
+        return found
+
+    async def _store(self, items: dict[str, M]) -> None:
+        if not items:
+            return
+        s = get_settings().directory_cache
+        ttl = self._ttl_s()
+        now = time.time()
+        for key, value in items.items():
+            self._l1.set(key, value, ttl=ttl, stale_ttl=s.STALE_TTL_S)
+        try:
+            async with get_redis_client().pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    payload = {"t": now, "v": value.model_dump(mode="json")}
+                    pipe.set(
+                        self._key(key), json.dumps(payload), ex=ttl + s.STALE_TTL_S
+                    )
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Не удалось записать справочник в L2 кэш", exc_info=True)
+
+    def _schedule_refresh(self, client: UserClient, keys: set[str]) -> None:
+        keys = keys - self._refreshing
+        if not keys:
+            return
+        self._refreshing |= keys
+        task = asyncio.ensure_future(self._refresh(client, keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, client: UserClient, keys: set[str]) -> None:
+        try:
+            self.stats.refreshes += 1
+            await self._store(await self._load(client, keys))
+        except Exception:
+            logger.warning(
+                "Не удалось обновить справочник %s", self.name, exc_info=True
+            )
+        finally:
+            self._refreshing -= keys
+
+
+class DirectoryCache:
+    """Кэш справочников сервиса пользователей для списков и карточек"""
+
+    def __init__(self):
+        self.users: EntityCache[User] = EntityCache(
+            "users",
+            User,
+            user_directory_loader.get_users,
+            lambda: get_settings().directory_cache.USERS_TTL_S,
+        )
+        self.organizations: EntityCache[Organization] = EntityCache(
+            "organizations",
+            Organization,
+            user_directory_loader.get_organizations,
+            lambda: get_settings().directory_cache.ORGANIZATIONS_TTL_S,
+        )
+        self.external_users: EntityCache[ExternalUser] = EntityCache(
+            "external_users",
+            ExternalUser,
+            user_directory_loader.get_external_users,
+            lambda: get_settings().directory_cache.EXTERNAL_USERS_TTL_S,
+        )
+
+    async def build_context(
+        self,
+        client: UserClient,
+        user_ids: Iterable,
+        organization_ids: Iterable,
+        external_user_ids: Iterable,
+    ) -> dict[str, dict]:
+        """Мапы для context у DocumentListItem / AddressGroups"""
+        users, organizations, external_users = await asyncio.gather(
+            self.users.get_many(client, user_ids),
+            self.organizations.get_many(client, organization_ids),
+            self.external_users.get_many(client, external_user_ids),
+        )
+        return {
+            "users": users,
+            "organizations": organizations,
+            "external_users": external_users,
+        }
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            cache.name: {**asdict(cache.stats), "l1_size": cache.l1_size}
+            for cache in (self.users, self.organizations, self.external_users)
+        }
+
+
+directory_cache = DirectoryCache()
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from enum import StrEnum
+from typing import Awaitable, Callable
+
+import httpx
+from fastapi import HTTPException
+
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+SendFn = Callable[[], Awaitable[httpx.Response]]
+
+# Ответы, после которых повтор имеет смысл
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+
+class BreakerState(StrEnum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class LatencyTracker:
+    """Скользящее окно задержек успешных запросов для расчёта p95"""
+
+    def __init__(self, size: int = 200):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def p95(self) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+
+class CircuitBreaker:
+    """
+    CLOSED -> OPEN после BREAKER_FAILURE_THRESHOLD неудач подряд.
+    В OPEN запросы сразу отклоняются; через BREAKER_RESET_TIMEOUT_S
+    пропускается одна пробная попытка (HALF_OPEN).
+    """
+
+    def __init__(self):
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == BreakerState.CLOSED:
+            return True
+        s = get_settings().http_client
+        if self.state == BreakerState.OPEN:
+            if time.monotonic() - self.opened_at < s.BREAKER_RESET_TIMEOUT_S:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Проба не дала результата (отмена) — следующий вызов пробует снова"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failures += 1
+        threshold = get_settings().http_client.BREAKER_FAILURE_THRESHOLD
+        if self.state == BreakerState.HALF_OPEN or self.failures >= threshold:
+            if self.state != BreakerState.OPEN:
+                logger.warning("Circuit breaker открыт после %s ошибок", self.failures)
+            self.state = BreakerState.OPEN
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class ResilienceStats:
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    rejected: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+
+
+class ResilientCaller:
+    """
+    Обёртка над идемпотентными запросами к внешнему сервису:
+    повторы с экспоненциальной задержкой и jitter, circuit breaker,
+    опционально hedged-запрос (вторая копия после задержки ~p95).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.counters = ResilienceStats()
+
+    async def call(self, send: SendFn, hedge: bool = False) -> httpx.Response:
+        s = get_settings().http_client
+        self.counters.calls += 1
+
+        if not self.breaker.allow():
+            self.counters.rejected += 1
+            raise HTTPException(
+                status_code=503, detail=f"Сервис {self.name} временно недоступен"
+            )
+
+        response: httpx.Response | None = None
+        error: Exception | None = None
+        try:
+            for attempt in range(s.RETRIES + 1):
+                if attempt:
+                    self.counters.retries += 1
+                    await asyncio.sleep(self._backoff(attempt))
+                try:
+                    started = time.monotonic()
+                    if hedge and s.HEDGE_ENABLED:
+                        response = await self._hedged(send)
+                    else:
+                        response = await send()
+                    error = None
+                except httpx.TransportError as e:
+                    response, error = None, e
+                    continue
+
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    continue
+                if response.status_code >= 500:
+                    # 500 не повторяем, но для breaker это отказ сервиса
+                    self.counters.failures += 1
+                    self.breaker.record_failure()
+                    return response
+                self.latency.add(time.monotonic() - started)
+                self.breaker.record_success()
+                return response
+        except asyncio.CancelledError:
+            # отмена (отключение клиента, таймаут) — не ошибка сервиса,
+            # но проба half-open не должна остаться занятой навсегда
+            self.breaker.release_probe()
+            raise
+        except Exception:
+            self.counters.failures += 1
+            self.breaker.record_failure()
+            raise
+
+        self.counters.failures += 1
+        self.breaker.record_failure()
+        if response is not None:
+            return response
+        raise HTTPException(
+            status_code=504 if isinstance(error, httpx.TimeoutException) else 503,
+            detail=f"Сервис {self.name} не отвечает: {error!r}",
+        )
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        s = get_settings().http_client
+        delay = min(s.RETRY_BACKOFF_MAX_S, s.RETRY_BACKOFF_BASE_S * 2 ** (attempt - 1))
+        # "equal jitter": половина задержки фиксирована, половина случайна
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _hedge_delay(self) -> float | None:
+        s = get_settings().http_client
+        if len(self.latency) < s.HEDGE_MIN_SAMPLES:
+            return None
+        return max(s.HEDGE_MIN_DELAY_S, self.latency.p95())
+
+    async def _hedged(self, send: SendFn) -> httpx.Response:
+        delay = self._hedge_delay()
+        if delay is None:
+            return await send()
+
+        first = asyncio.ensure_future(send())
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+
+            self.counters.hedges += 1
+            second = asyncio.ensure_future(send())
+            pending = {first, second}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.counters.hedge_wins += 1
+                        return task.result()
+            # обе копии упали — отдаём ошибку первой
+            return first.result()
+        finally:
+            # в том числе при отмене внешней задачи
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            **asdict(self.counters),
+            "breaker_state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "latency_p95_s": round(self.latency.p95(), 4),
+        }
+
+
+users_service_resilience = ResilientCaller("users")
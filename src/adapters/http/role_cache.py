@@ -0,0 +1,88 @@
+import json
+import logging
+import uuid
+from typing import Iterable
+
+from redis.exceptions import RedisError
+
+from src.adapters.http.user_client import UserClient
+from src.adapters.redis.client import get_redis_client, cache_key
+from src.common.cache import SingleFlight
+from src.common.enum.user_roles import UserRolesEnum
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Роли, которые используются при построении маршрутов
+WORKFLOW_ROLES = (UserRolesEnum.ROLE_VSM_DOCFLOW_REGISTRATOR,)
+
+
+class RoleMembersCache:
+    """
+    Кэш роль -> ID пользователей в Redis (общий для воркеров)
+    с коротким TTL (ROLE_MEMBERS_TTL_S) и ручной инвалидацией.
+    """
+
+    def __init__(self):
+        self._flight: SingleFlight[str, list[uuid.UUID]] = SingleFlight()
+
+    @staticmethod
+    def _key(role: UserRolesEnum) -> str:
+        return cache_key("role-members", str(role))
+
+    async def get_user_ids(
+        self, client: UserClient, role: UserRolesEnum
+    ) -> list[uuid.UUID]:
+        key = self._key(role)
+        return await self._flight.do(key, lambda: self._load(key, client, role))
+
+    async def invalidate(self, *roles: UserRolesEnum) -> None:
+        keys = [self._key(role) for role in roles or UserRolesEnum]
+        for key in keys:
+            self._flight.forget(key)
+        try:
+            await get_redis_client().delete(*keys)
+        except RedisError:
+            logger.warning("Не удалось сбросить кэш ролей", exc_info=True)
+
+    async def preload(self, roles: Iterable[UserRolesEnum] = WORKFLOW_ROLES) -> None:
+        """Прогрев на старте под технической сессией USERS_SERVICE_SESSION"""
+        session_id = get_settings().services.USERS_SERVICE_SESSION
+        if not session_id:
+            logger.info("USERS_SERVICE_SESSION не задан, прогрев ролей пропущен")
+            return
+        client = UserClient(session_id=session_id)
+        for role in roles:
+            try:
+                await self._load(self._key(role), client, role, force=True)
+            except Exception:
+                logger.warning("Не удалось прогреть роль %s", role, exc_info=True)
+
+    async def _load(
+        self,
+        key: str,
+        client: UserClient,
+        role: UserRolesEnum,
+        force: bool = False,
+    ) -> list[uuid.UUID]:
+        redis = get_redis_client()
+        if not force:
+            try:
+                if raw := await redis.get(key):
+                    return [uuid.UUID(i) for i in json.loads(raw)]
+            except RedisError:
+                logger.warning("Кэш ролей недоступен", exc_info=True)
+
+        user_ids = await client.get_user_ids_from_role(role)
+        try:
+            await redis.set(
+                key,
+                json.dumps([str(i) for i in user_ids]),
+                ex=get_settings().redis.ROLE_MEMBERS_TTL_S,
+            )
+        except RedisError:
+            logger.warning("Не удалось записать роль в кэш", exc_info=True)
+        return user_ids
+
+
+role_members_cache = RoleMembersCache()
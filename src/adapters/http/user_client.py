@@ -2,9 +2,10 @@ from datetime import datetime
 from typing import Optional, List
 
 from fastapi import HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
-from src.adapters.http.client import get_http_client
+from src.adapters.http.client import get_http_client, ExternalService
+from src.adapters.http.resilience import users_service_resilience
 from src.common.enum import EnumData
 from src.common.enum.user_roles import UserRolesEnum
 from src.core.settings import get_settings
@@ -12,6 +13,9 @@ import uuid, json
 
 
 class User(BaseModel):
+    # экземпляры из кэша справочников разделяются между запросами
+    model_config = ConfigDict(frozen=True)
+
     id: uuid.UUID
     avatar: Optional[str] = None
     status_text: str
@@ -24,11 +28,15 @@ class User(BaseModel):
 
 
 class ExternalUserOrganization(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: uuid.UUID
     name: str
 
 
 class ExternalUser(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: uuid.UUID
     first_name: str
     last_name: str
@@ -40,6 +48,8 @@ class ExternalUser(BaseModel):
 
 
 class Organization(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: uuid.UUID
     name: str
     is_active: bool
@@ -47,76 +57,103 @@ class Organization(BaseModel):
     kpp_number: str
 
 
+# Валидаторы списков строятся один раз и разбирают ответ прямо из байтов
+users_adapter = TypeAdapter(Optional[List[User]])
+organizations_adapter = TypeAdapter(Optional[List[Organization]])
+external_users_adapter = TypeAdapter(Optional[List[ExternalUser]])
+
+
 class UserClient:
     """Клиент для взаимодействия с сервисом пользователей"""
 
     def __init__(self, session_id: str):
         self.settings = get_settings()
-        self._http = get_http_client()
+        self._http = get_http_client(ExternalService.USERS)
         self.session_id = session_id
 
     def request(self):
-        cookies = {"SESSION": self.session_id}
-        self._http.cookies.update(cookies)
         return self._http
 
+    @property
+    def auth_headers(self) -> dict[str, str]:
+        """Сессия передаётся в каждом запросе, а не в общем cookie jar клиента"""
+        if not self.session_id:
+            return {}
+        return {"Cookie": f"SESSION={self.session_id}"}
+
     async def get_current_user(self) -> User:
         """Возвращает текущего пользователя в системе"""
 
-        response = await self.request().get(
-            url=f"{self.settings.services.USERS_SERVICE_URL}/current-user-info"
+        response = await users_service_resilience.call(
+            lambda: self.request().get(
+                url=f"{self.settings.services.USERS_SERVICE_URL}/current-user-info",
+                headers=self.auth_headers,
+            )
         )
         if response.status_code != 200:
             raise HTTPException(status_code=response.status_code, detail=response.text)
 
-        return User.model_validate(response.json())
+        return User.model_validate_json(response.content)
 
     async def get_users(self, ids: list) -> dict[str, User]:
         data = {}
-        response = await self.request().post(
-            url=f"{self.settings.services.USERS_SERVICE_URL}/event-users-info",
-            json={"ids": list(set(ids))},
+        response = await users_service_resilience.call(
+            lambda: self.request().post(
+                url=f"{self.settings.services.USERS_SERVICE_URL}/event-users-info",
+                json={"ids": list(set(ids))},
+                headers=self.auth_headers,
+            ),
+            hedge=True,
         )
         if response.status_code != 200:
             raise HTTPException(status_code=response.status_code, detail=response.text)
-        if response_data := response.json():
-            for user in response_data:
-                user = User.model_validate(user)
-                data[str(user.id)] = user
+        for user in users_adapter.validate_json(response.content) or []:
+            data[str(user.id)] = user
         return data
 
     async def get_organizations(self, ids: list) -> dict[str, User]:
         data = {}
-        response = await self.request().post(
-            url=f"{self.settings.services.USERS_SERVICE_URL}/event-organizations-info",
-            json={"ids": list(ids)},
+        response = await users_service_resilience.call(
+            lambda: self.request().post(
+                url=f"{self.settings.services.USERS_SERVICE_URL}/event-organizations-info",
+                json={"ids": list(ids)},
+                headers=self.auth_headers,
+            ),
+            hedge=True,
         )
         if response.status_code != 200:
             raise HTTPException(status_code=response.status_code, detail=response.text)
-        if response_data := response.json():
-            for organization in response_data:
-                organization = Organization.model_validate(organization)
-                data[str(organization.id)] = organization
+        for organization in (
+            organizations_adapter.validate_json(response.content) or []
+        ):
+            data[str(organization.id)] = organization
         return data
 
     async def get_external_users(self, ids: list) -> dict[str, User]:
         data = {}
-        response = await self.request().post(
-            url=f"{self.settings.services.USERS_SERVICE_URL}/event-external-users-info",
-            json={"ids": list(ids)},
+        response = await users_service_resilience.call(
+            lambda: self.request().post(
+                url=f"{self.settings.services.USERS_SERVICE_URL}/event-external-users-info",
+                json={"ids": list(ids)},
+                headers=self.auth_headers,
+            ),
+            hedge=True,
         )
         if response.status_code != 200:
             raise HTTPException(status_code=response.status_code, detail=response.text)
-        if response_data := response.json():
-            for external_user in response_data:
-                external_user = ExternalUser.model_validate(external_user)
-                data[str(external_user.id)] = external_user
+        for external_user in (
+            external_users_adapter.validate_json(response.content) or []
+        ):
+            data[str(external_user.id)] = external_user
         return data
 
     async def get_user_ids_from_role(self, role: UserRolesEnum) -> list[uuid.UUID]:
-        response = await self.request().post(
-            url=f"{self.settings.services.USERS_SERVICE_URL}/users-by-role",
-            json={"role": role},
+        response = await users_service_resilience.call(
+            lambda: self.request().post(
+                url=f"{self.settings.services.USERS_SERVICE_URL}/users-by-role",
+                json={"role": role},
+                headers=self.auth_headers,
+            ),
         )
         if response.status_code != 200:
             raise HTTPException(status_code=response.status_code, detail=response.text)
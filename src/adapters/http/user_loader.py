@@ -0,0 +1,116 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Iterable, TypeVar
+
+from src.adapters.http.user_client import (
+    UserClient,
+    User,
+    Organization,
+    ExternalUser,
+)
+from src.core.settings import get_settings
+
+T = TypeVar("T")
+
+FetchFn = Callable[[UserClient, list[str]], Awaitable[dict[str, T]]]
+
+
+class _Batch(Generic[T]):
+    """Набор ID, накопленный за одно окно"""
+
+    def __init__(self, client: UserClient):
+        self.client = client
+        self.ids: set[str] = set()
+        self.future: asyncio.Future[dict[str, T]] = (
+            asyncio.get_running_loop().create_future()
+        )
+
+
+class BatchLoader(Generic[T]):
+    """
+    Склеивает запросы справочника от конкурентных запросов воркера.
+    ID, запрошенные в течение BATCH_WINDOW_MS, уходят одним вызовом;
+    большие наборы режутся на чанки по CHUNK_SIZE, которые выполняются
+    параллельно, но не более MAX_CONCURRENCY одновременно.
+    Пачки ведутся отдельно для каждой сессии: ID пользователя уходят
+    только с его собственными учётными данными.
+    """
+
+    def __init__(self, fetch: FetchFn[T]):
+        self._fetch = fetch
+        self._batches: dict[str | None, _Batch[T]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, client: UserClient, ids: Iterable) -> dict[str, T]:
+        keys = {str(i) for i in ids if i}
+        if not keys:
+            return {}
+
+        batch = self._batches.get(client.session_id)
+        if batch is None:
+            batch = self._batches[client.session_id] = _Batch(client)
+            window = get_settings().user_directory.BATCH_WINDOW_MS / 1000
+            asyncio.get_running_loop().call_later(window, self._dispatch, batch)
+        batch.ids |= keys
+
+        result = await asyncio.shield(batch.future)
+        # каждому вызывающему — только его ID
+        return {k: result[k] for k in keys if k in result}
+
+    def _dispatch(self, batch: _Batch[T]) -> None:
+        if self._batches.get(batch.client.session_id) is batch:
+            del self._batches[batch.client.session_id]
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _Batch[T]) -> None:
+        s = get_settings().user_directory
+        ids = sorted(batch.ids)
+        chunks = [ids[i : i + s.CHUNK_SIZE] for i in range(0, len(ids), s.CHUNK_SIZE)]
+        semaphore = asyncio.Semaphore(s.MAX_CONCURRENCY)
+
+        async def fetch_chunk(chunk: list[str]) -> dict[str, T]:
+            async with semaphore:
+                return await self._fetch(batch.client, chunk)
+
+        try:
+            parts = await asyncio.gather(*(fetch_chunk(c) for c in chunks))
+        except Exception as e:
+            batch.future.set_exception(e)
+            return
+
+        merged: dict[str, T] = {}
+        for part in parts:
+            merged.update(part)
+        batch.future.set_result(merged)
+
+
+class UserDirectoryLoader:
+    """Пакетный фасад над UserClient для справочных запросов"""
+
+    def __init__(self):
+        self._users: BatchLoader[User] = BatchLoader(
+            lambda client, ids: client.get_users(ids=ids)
+        )
+        self._organizations: BatchLoader[Organization] = BatchLoader(
+            lambda client, ids: client.get_organizations(ids=ids)
+        )
+        self._external_users: BatchLoader[ExternalUser] = BatchLoader(
+            lambda client, ids: client.get_external_users(ids=ids)
+        )
+
+    async def get_users(self, client: UserClient, ids: Iterable) -> dict[str, User]:
+        return await self._users.load(client, ids)
+
+    async def get_organizations(
+        self, client: UserClient, ids: Iterable
+    ) -> dict[str, Organization]:
+        return await self._organizations.load(client, ids)
+
+    async def get_external_users(
+        self, client: UserClient, ids: Iterable
+    ) -> dict[str, ExternalUser]:
+        return await self._external_users.load(client, ids)
+
+
+user_directory_loader = UserDirectoryLoader()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from redis.asyncio import Redis
+
+from src.core.settings import get_settings
+
+_redis: Redis | None = None
+
+
+def get_redis_client() -> Redis:
+    """
+    Ленивая инициализация общего клиента Redis.
+    Повторные вызовы возвращают один и тот же клиент (общий пул соединений).
+    """
+    global _redis
+    if _redis is None:
+        s = get_settings()
+        _redis = Redis.from_url(s.redis.URL)
+    return _redis
+
+
+async def aclose_redis_client() -> None:
+    """Корректно закрыть клиент на shutdown."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+    _redis = None
+
+
+def cache_key(*parts: str) -> str:
+    """Ключ в пространстве имён сервиса: <NAMESPACE>:<part>:<part>..."""
+    return ":".join((get_settings().redis.NAMESPACE, *parts))
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,7 +7,9 @@ from src.adapters.http.user_client import User
 import uuid
 from fastapi import Request, HTTPException
 
-from src.modules.correspondence.domain.models import Document
+if TYPE_CHECKING:
+    # только для аннотаций: черновик (src/draft/V3) объявляет те же таблицы
+    from src.modules.correspondence.domain.models import Document
 
 
 class BaseDocumentAction(ABC):
@@ -15,7 +17,7 @@ class BaseDocumentAction(ABC):
     def __init__(
         self,
         user: User,
-        document: Document,
+        document: "Document",
         db: AsyncSession,
         request: Optional[Request] = None,
     ):
@@ -24,7 +26,7 @@ class BaseDocumentAction(ABC):
         self.db = db
         self.request = request
 
-        self.document: Optional[Document] = None
+        self.document: Optional["Document"] = None
 
     async def execute(self):
         """
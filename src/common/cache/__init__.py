@@ -0,0 +1,2 @@
+from src.common.cache.single_flight import SingleFlight
+from src.common.cache.lru import LRUCache
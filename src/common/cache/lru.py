@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Ограниченный по размеру in-process LRU.
+    Запись свежая ttl секунд, после этого ещё stale_ttl секунд отдаётся
+    как устаревшая (stale-while-revalidate), затем удаляется.
+    """
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._data: OrderedDict[K, tuple[V, float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[tuple[V, bool]]:
+        """Возвращает (значение, is_stale) или None"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, fresh_until, expires_at = entry
+        now = time.monotonic()
+        if now >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value, now >= fresh_until
+
+    def set(self, key: K, value: V, ttl: float, stale_ttl: float = 0) -> None:
+        now = time.monotonic()
+        self._data[key] = (value, now + ttl, now + ttl + stale_ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Склеивает конкурентные вызовы с одинаковым ключом в один.
+    Пока первый вызов не завершился, остальные ждут его результат.
+    Работает в пределах одного воркера (event loop).
+    """
+
+    def __init__(self):
+        self._calls: dict[K, asyncio.Future[V]] = {}
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._release(key, f))
+        # shield: отмена одного ожидающего не отменяет общий вызов
+        return await asyncio.shield(future)
+
+    def forget(self, key: K) -> None:
+        """Новые вызовы не присоединятся к уже идущему"""
+        self._calls.pop(key, None)
+
+    def _release(self, key: K, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from src.core.db_instrumentation import QueryStats, collect_queries
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """
+    Падает, если внутри блока выполнено больше limit SQL запросов:
+
+        with assert_max_queries(6):
+            await client.post("/api-documents/correspondence/list")
+    """
+    with collect_queries() as stats:
+        yield stats
+    if stats.queries > limit:
+        listing = "\n".join(
+            f"{i}. {sql}" for i, sql in enumerate(stats.statements, start=1)
+        )
+        raise AssertionError(
+            f"Ожидалось не более {limit} SQL запросов, выполнено {stats.queries}:\n"
+            f"{listing}"
+        )
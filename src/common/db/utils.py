@@ -30,3 +30,12 @@ async def first(
 
     result = await db.execute(stmt)
     return result.scalars().first()
+
+
+def escape_like(value: str, escape: str = "\\") -> str:
+    """Экранирует %, _ и сам escape-символ для LIKE/ILIKE"""
+    return (
+        value.replace(escape, escape * 2)
+        .replace("%", f"{escape}%")
+        .replace("_", f"{escape}_")
+    )
@@ -1,2 +1,4 @@
 from src.common.pagination.schema import *
+from src.common.pagination.cursor import *
+from src.common.pagination.count import *
 from src.common.pagination.utils import *
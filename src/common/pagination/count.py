@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from enum import StrEnum
+from functools import cache
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from src.adapters.redis.client import get_redis_client, cache_key
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CountMode(StrEnum):
+    """Способ получения total для списка"""
+
+    # точный count(*) по «тонкому» запросу без вычисляемых колонок
+    EXACT = "exact"
+    # оценка планировщика (EXPLAIN), без чтения таблицы
+    APPROXIMATE = "approximate"
+    # точный, но закэшированный на пользователя и фильтр до ближайшей записи
+    CACHED = "cached"
+    # не считать (бесконечная прокрутка)
+    NONE = "none"
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) для произвольного select с bind-параметрами"""
+
+    inherit_cache = True
+    _traverse_internals = [("statement", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@cache
+def _count_statement(rows_query: Select) -> Select:
+    return select(func.count()).select_from(rows_query.subquery())
+
+
+@cache
+def _explain_statement(rows_query: Select) -> Explain:
+    return Explain(rows_query)
+
+
+class ListCounter:
+    """
+    total для списков одной области (scope).
+    rows_query — запрос строк списка с фильтрами, но без тяжёлых выражений
+    и сортировки; должен строиться один раз, иначе не сработают кэши.
+    """
+
+    def __init__(self, scope: str):
+        self.scope = scope
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def _key(self) -> str:
+        return cache_key("count", self.scope)
+
+    async def count(
+        self,
+        db: AsyncSession,
+        mode: CountMode,
+        rows_query: Select,
+        params: Optional[dict] = None,
+        user_id: Optional[uuid.UUID] = None,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> Optional[int]:
+        if mode == CountMode.NONE:
+            return None
+        if mode == CountMode.APPROXIMATE:
+            return await self._approximate(db, rows_query, params)
+        if mode == CountMode.CACHED:
+            return await self._cached(db, rows_query, params, user_id, filters)
+        return await db.scalar(_count_statement(rows_query), params)
+
+    async def invalidate(self) -> None:
+        """Сбрасывает закэшированные total всех пользователей области"""
+        try:
+            await get_redis_client().delete(self._key)
+        except RedisError:
+            logger.warning("Не удалось сбросить кэш total %s", self.scope)
+
+    def invalidate_soon(self) -> None:
+        """invalidate() из синхронного кода (события сессии) фоновой задачей"""
+        try:
+            task = asyncio.get_running_loop().create_task(self.invalidate())
+        except RuntimeError:
+            logger.warning("Нет event loop, кэш total %s не сброшен", self.scope)
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _approximate(
+        db: AsyncSession, rows_query: Select, params: Optional[dict]
+    ) -> int:
+        plan = await db.scalar(_explain_statement(rows_query), params)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def _cached(
+        self,
+        db: AsyncSession,
+        rows_query: Select,
+        params: Optional[dict],
+        user_id: Optional[uuid.UUID],
+        filters: Optional[dict[str, Any]],
+    ) -> int:
+        raw_filters = json.dumps(filters or {}, sort_keys=True, default=str)
+        digest = hashlib.sha1(raw_filters.encode()).hexdigest()[:16]
+        field = f"{user_id}:{digest}"
+        redis = get_redis_client()
+        try:
+            if (cached := await redis.hget(self._key, field)) is not None:
+                return int(cached)
+        except RedisError:
+            logger.warning("Кэш total недоступен", exc_info=True)
+
+        total = await db.scalar(_count_statement(rows_query), params)
+        try:
+            # все total области живут в одном hash: запись сбрасывает его целиком
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hset(self._key, field, total)
+                pipe.expire(self._key, get_settings().pagination.COUNT_CACHE_TTL_S)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Не удалось сохранить total в кэш", exc_info=True)
+        return total
@@ -0,0 +1,40 @@
+import base64
+from datetime import datetime
+import uuid
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import ColumnElement, tuple_
+
+
+class Cursor(BaseModel):
+    """
+    Позиция в списке, упорядоченном по (created_at DESC, id DESC).
+    Клиенту отдаётся непрозрачной строкой.
+    """
+
+    created_at: datetime
+    id: uuid.UUID
+
+    def encode(self) -> str:
+        raw = self.model_dump_json().encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            return cls.model_validate_json(raw)
+        except (ValueError, ValidationError):
+            raise HTTPException(status_code=400, detail="Некорректный cursor")
+
+
+def keyset_after(
+    created_at: ColumnElement, id_: ColumnElement, cursor_created_at, cursor_id
+) -> ColumnElement:
+    """
+    Строки после курсора при ORDER BY created_at DESC, id DESC.
+    Сравнение кортежей Postgres проходит по индексу (created_at, id)
+    обратным сканированием, поэтому глубина страницы не влияет на стоимость.
+    """
+    return tuple_(created_at, id_) < tuple_(cursor_created_at, cursor_id)
@@ -1,8 +1,10 @@
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, List, Optional
 
 from fastapi import Query
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
+from src.common.pagination.count import CountMode
+from src.common.pagination.cursor import Cursor
 from src.core.settings import get_settings
 
 T = TypeVar("T")
@@ -13,6 +15,9 @@ class PageParams(BaseModel):
     """
     Query-параметры пагинации.
     Использование в эндпоинте: q: PageParams = Depends()
+
+    Без cursor работает постранично (page); с cursor из nextCursor
+    предыдущего ответа — по ключу, page при этом игнорируется.
     """
 
     page: int = Field(
@@ -26,6 +31,12 @@ class PageParams(BaseModel):
             description=f"Размер страницы (<= {_settings.pagination.MAX_LIMIT})",
         )
     )
+    cursor: Optional[str] = Field(
+        default=Query(None, description="nextCursor из предыдущего ответа")
+    )
+    count: Optional[CountMode] = Field(
+        default=Query(None, description="Способ подсчёта total; none — не считать")
+    )
 
     # на всякий случай «зажмём» limit в рантайме по текущим настройкам
     @field_validator("per_page")
@@ -34,14 +45,24 @@ class PageParams(BaseModel):
         max_lim = _settings.pagination.MAX_LIMIT
         return min(v, max_lim)
 
+    @property
+    def decoded_cursor(self) -> Optional[Cursor]:
+        return Cursor.decode(self.cursor) if self.cursor else None
+
+    @property
+    def count_mode(self) -> CountMode:
+        return self.count or CountMode(_settings.pagination.COUNT_MODE)
+
 
 class PageOut(BaseModel, Generic[T]):
     """
     Универсальная модель ответа с пагинацией.
     """
 
-    total: int
+    # None при count=none
+    total: Optional[int]
     data: List[T]
-    lastPage: int
+    lastPage: Optional[int]
     perPage: int
     currentPage: int
+    nextCursor: Optional[str] = None
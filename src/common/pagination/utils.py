@@ -1,15 +1,28 @@
 from math import ceil
+from typing import Optional
 
 from src.common.pagination.schema import T, PageOut
 
 
-def make_page(items: list[T], total: int, page: int, limit: int) -> PageOut[T]:
+def make_page(
+    items: list[T],
+    total: Optional[int],
+    page: int,
+    limit: int,
+    next_cursor: Optional[str] = None,
+) -> PageOut[T]:
     """
     Собрать PageOut из списка и total. page начинается с 1.
+    next_cursor — курсор следующей страницы (None, если она последняя).
+    total=None — подсчёт пропущен, lastPage тогда тоже None.
     """
 
-    last = max(ceil(total / limit), 1) if total else 1
-    page = max(min(page, last), 1)
+    if total is None:
+        last = None
+        page = max(page, 1)
+    else:
+        last = max(ceil(total / limit), 1) if total else 1
+        page = max(min(page, last), 1)
 
     return PageOut[T](
         total=total,
@@ -17,4 +30,5 @@ def make_page(items: list[T], total: int, page: int, limit: int) -> PageOut[T]:
         lastPage=last,
         perPage=limit,
         currentPage=page,
+        nextCursor=next_cursor,
     )
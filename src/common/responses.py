@@ -0,0 +1,41 @@
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+# ответ зависит от пользователя: общие кеши его не хранят,
+# браузер каждый раз переспрашивает с If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON-ответ без jsonable_encoder: содержимое (dict, list, модели pydantic)
+    сериализуется напрямую в pydantic-core. Форматы datetime/UUID/enum
+    те же, что при сериализации через response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Слабое сравнение с If-None-Match (список тегов через запятую или *)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        return tag.strip().removeprefix("W/")
+
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -1,14 +1,26 @@
 from fastapi import Request
 
 from src.adapters.http.user_client import UserClient, User
+from src.core.session_cache import session_user_cache
 
 
 async def get_current_user(request: Request) -> User:
     """Получение авторизованного пользователя"""
+    session_id = request.cookies.get("SESSION")
     user_client = UserClient(
-        session_id=request.cookies.get("SESSION"),
+        session_id=session_id,
     )
-    user = await user_client.get_current_user()
+    if session_id:
+        user = await session_user_cache.get_or_fetch(
+            session_id, user_client.get_current_user
+        )
+    else:
+        user = await user_client.get_current_user()
     request.state.user = user
 
     return user
+
+
+async def evict_session(session_id: str) -> None:
+    """Сбросить закэшированного пользователя сессии (logout / отзыв сессии)"""
+    await session_user_cache.evict(session_id)
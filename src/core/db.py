@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 from typing import AsyncIterator
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -11,6 +12,8 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase, declared_attr
 
+from src.core.db_instrumentation import install_query_instrumentation
+from src.core.db_pool import instrumented_pool_class, track_connects
 from src.core.settings import get_settings
 
 settings = get_settings()
@@ -38,10 +41,26 @@ class Base(DeclarativeBase):
 
 
 # Async Engine / Session factory
-engine: AsyncEngine = create_async_engine(
-    settings.db.database_url,
-    echo=settings.db.ECHO,
-)
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        echo=settings.db.ECHO,
+        poolclass=instrumented_pool_class(name),
+        pool_size=settings.db.POOL_SIZE,
+        max_overflow=settings.db.MAX_OVERFLOW,
+        pool_timeout=settings.db.POOL_TIMEOUT_S,
+        pool_recycle=settings.db.POOL_RECYCLE_S,
+        pool_pre_ping=settings.db.POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.db.STATEMENT_CACHE_SIZE
+        },
+    )
+    track_connects(new_engine.sync_engine.pool)
+    install_query_instrumentation(new_engine)
+    return new_engine
+
+
+engine: AsyncEngine = _create_engine(settings.db.database_url, "primary")
 
 SessionLocal = async_sessionmaker(
     bind=engine,
@@ -50,6 +69,24 @@ SessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Реплика для чтения (опционально)
+read_engine: AsyncEngine | None = (
+    _create_engine(settings.db.REPLICA_URL, "replica")
+    if settings.db.REPLICA_URL
+    else None
+)
+
+ReadSessionLocal = (
+    async_sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+    if read_engine is not None
+    else None
+)
+
 
 async def get_session() -> AsyncIterator[AsyncSession]:
     """
@@ -61,9 +98,30 @@ async def get_session() -> AsyncIterator[AsyncSession]:
         yield session
 
 
+async def warmup_engine(connections: int) -> None:
+    """Заранее открыть соединения пула, чтобы первые запросы не платили за connect"""
+    if connections <= 0:
+        return
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [r for r in results if not isinstance(r, BaseException)]
+    try:
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in opened))
+    finally:
+        # соединения возвращаются в пул, а не закрываются
+        await asyncio.gather(*(conn.close() for conn in opened))
+
+
 __all__ = [
     "Base",
     "engine",
     "SessionLocal",
+    "read_engine",
+    "ReadSessionLocal",
     "get_session",
+    "warmup_engine",
 ]
@@ -0,0 +1,130 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Счётчики SQL в пределах запроса (или блока collect_queries)"""
+
+    queries: int = 0
+    total_time_s: float = 0.0
+    rows: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    statements: list[str] = field(default_factory=list)
+
+    def record(
+        self, statement: str, elapsed_s: float, rows: int, cache_hit: Any
+    ) -> None:
+        self.queries += 1
+        self.total_time_s += elapsed_s
+        self.rows += max(rows, 0)
+        self.statements.append(statement)
+        if cache_hit is CACHE_HIT:
+            self.cache_hits += 1
+        elif cache_hit is CACHE_MISS:
+            self.cache_misses += 1
+
+
+@dataclass
+class CompiledCacheStats:
+    """Попадания в compiled cache SQLAlchemy за время жизни процесса"""
+
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, cache_hit: Any) -> None:
+        if cache_hit is CACHE_HIT:
+            self.hits += 1
+        elif cache_hit is CACHE_MISS:
+            self.misses += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
+
+
+compiled_cache_stats = CompiledCacheStats()
+
+
+# Активные сборщики: middleware запроса, вложенные collect_queries в тестах
+_collectors: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+    "query_stats_collectors", default=()
+)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """Собирает статистику SQL, выполненного внутри блока"""
+    stats = QueryStats()
+    token = _collectors.set((*_collectors.get(), stats))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Значения параметров в лог не попадают — только их типы"""
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(p) for p in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _, started_at = conn.info["query_started_at"].pop()
+    elapsed = time.perf_counter() - started_at
+    rows = getattr(cursor, "rowcount", -1)
+    # CACHE_HIT / CACHE_MISS / NO_CACHE_KEY ...; у exec_driver_sql контекста нет
+    cache_hit = getattr(context, "cache_hit", None)
+    compiled_cache_stats.record(cache_hit)
+    for stats in _collectors.get():
+        stats.record(statement, elapsed, rows, cache_hit)
+
+    slow_ms = get_settings().db.SLOW_QUERY_MS
+    if slow_ms and elapsed * 1000 >= slow_ms:
+        logger.warning(
+            "Медленный запрос %.1f мс: %s; параметры: %s",
+            elapsed * 1000,
+            statement,
+            redact_parameters(parameters),
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # упавший запрос не доходит до after_cursor_execute: снимаем его отметку,
+    # иначе следующие замеры на этом соединении считаются от чужого старта
+    conn = exception_context.connection
+    started = conn.info.get("query_started_at") if conn is not None else None
+    if started and started[-1][0] is exception_context.execution_context:
+        started.pop()
+
+
+def install_query_instrumentation(engine: AsyncEngine | Engine) -> None:
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
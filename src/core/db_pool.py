@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+# окно для расчёта скорости создания соединений
+RATE_WINDOW_S = 60.0
+
+
+class PoolMetrics:
+    """Накопительные метрики пула соединений"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_created = 0
+        self.checkouts = 0
+        self.wait_time_total_s = 0.0
+        self.wait_time_max_s = 0.0
+        self._created_at: deque[float] = deque()
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total_s += seconds
+            self.wait_time_max_s = max(self.wait_time_max_s, seconds)
+
+    def record_connect(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.connections_created += 1
+            self._created_at.append(now)
+            self._trim(now)
+
+    def creation_rate_per_s(self) -> float:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            return len(self._created_at) / RATE_WINDOW_S
+
+    def _trim(self, now: float) -> None:
+        while self._created_at and now - self._created_at[0] > RATE_WINDOW_S:
+            self._created_at.popleft()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, который замеряет ожидание свободного соединения"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.record_wait(time.perf_counter() - started)
+
+
+def instrumented_pool_class(name: str) -> type[InstrumentedAsyncPool]:
+    """
+    Класс пула со своими метриками — по одному на engine.
+    Класс (а не экземпляр) нужен, чтобы метрики переживали engine.dispose().
+    """
+    return type(
+        f"InstrumentedAsyncPool[{name}]",
+        (InstrumentedAsyncPool,),
+        {"metrics": PoolMetrics()},
+    )
+
+
+def track_connects(pool: Pool) -> None:
+    """
+    Считать новые соединения пула (в том числе переоткрытые после recycle).
+    Слушатель вешается на экземпляр: на подклассах AsyncAdaptedQueuePool
+    события уровня класса не регистрируются. После dispose() новый пул
+    получает слушатели старого.
+    """
+    if not isinstance(pool, InstrumentedAsyncPool):
+        return
+    metrics = pool.metrics
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        metrics.record_connect()
+
+
+def pool_stats(pool: Pool) -> dict:
+    """Текущее состояние пула и накопленные метрики"""
+    if not isinstance(pool, InstrumentedAsyncPool):
+        return {"size": pool.size() if hasattr(pool, "size") else None}
+    metrics = pool.metrics
+    stats = {
+        "connections_created": metrics.connections_created,
+        "connection_creation_rate_per_s": round(metrics.creation_rate_per_s(), 3),
+        "checkouts": metrics.checkouts,
+        "wait_time_total_ms": round(metrics.wait_time_total_s * 1000, 2),
+        "wait_time_avg_ms": round(
+            (
+                metrics.wait_time_total_s / metrics.checkouts * 1000
+                if metrics.checkouts
+                else 0.0
+            ),
+            3,
+        ),
+        "wait_time_max_ms": round(metrics.wait_time_max_s * 1000, 2),
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow_in_use": max(pool.overflow(), 0),
+    }
+    return stats
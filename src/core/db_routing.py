@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import AsyncIterator
+
+from fastapi import Depends, Request
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.adapters.http.user_client import User
+from src.adapters.redis.client import get_redis_client, cache_key
+from src.core.auth import get_current_user
+from src.core.db import SessionLocal, ReadSessionLocal, read_engine
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики; 0, если всё полученное WAL уже применено
+REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE("
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReplicaMonitor:
+    """
+    Состояние реплики: доступна ли и не отстаёт ли больше REPLICA_MAX_LAG_S.
+    Проверка кэшируется на REPLICA_CHECK_INTERVAL_S.
+    """
+
+    def __init__(self):
+        self.healthy = False
+        self.lag_s: float | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def is_usable(self) -> bool:
+        if read_engine is None:
+            return False
+        s = get_settings().db
+        if time.monotonic() - self._checked_at < s.REPLICA_CHECK_INTERVAL_S:
+            return self.healthy
+        async with self._lock:
+            if time.monotonic() - self._checked_at >= s.REPLICA_CHECK_INTERVAL_S:
+                await self._check()
+        return self.healthy
+
+    async def _check(self) -> None:
+        s = get_settings().db
+        try:
+            async with read_engine.connect() as conn:
+                lag = await asyncio.wait_for(
+                    conn.scalar(REPLICA_LAG_SQL),
+                    timeout=get_settings().http.READINESS_CHECK_TIMEOUT_S,
+                )
+            self.lag_s = float(lag or 0)
+            healthy = self.lag_s <= s.REPLICA_MAX_LAG_S
+        except Exception:
+            logger.warning("Реплика недоступна", exc_info=True)
+            self.lag_s = None
+            healthy = False
+        if healthy != self.healthy:
+            logger.info("Реплика %s", "в строю" if healthy else "выведена из чтения")
+        self.healthy = healthy
+        self._checked_at = time.monotonic()
+
+
+class ReadYourWrites:
+    """
+    Помнит пользователей, которые недавно писали, чтобы их чтения шли
+    в primary. Redis — общий для воркеров, локальный словарь — на случай
+    недоступности Redis.
+    """
+
+    def __init__(self):
+        self._local: dict[uuid.UUID, float] = {}
+
+    @staticmethod
+    def _key(user_id: uuid.UUID) -> str:
+        return cache_key("ryw", str(user_id))
+
+    async def mark_write(self, user_id: uuid.UUID) -> None:
+        window = get_settings().db.READ_YOUR_WRITES_WINDOW_S
+        self._local[user_id] = time.monotonic() + window
+        try:
+            await get_redis_client().set(self._key(user_id), 1, px=int(window * 1000))
+        except RedisError:
+            logger.warning("Не удалось отметить запись пользователя", exc_info=True)
+
+    async def recently_wrote(self, user_id: uuid.UUID) -> bool:
+        until = self._local.get(user_id)
+        if until is not None:
+            if until > time.monotonic():
+                return True
+            del self._local[user_id]
+        try:
+            return bool(await get_redis_client().exists(self._key(user_id)))
+        except RedisError:
+            # без Redis не можем гарантировать свежесть — читаем из primary
+            return True
+
+
+replica_monitor = ReplicaMonitor()
+read_your_writes = ReadYourWrites()
+
+
+async def choose_read_sessionmaker(
+    user_id: uuid.UUID,
+) -> tuple[async_sessionmaker[AsyncSession], str]:
+    """
+    Реплика, если она настроена, здорова и пользователь недавно ничего
+    не писал; иначе primary. Возвращает фабрику сессий и имя маршрута.
+    """
+    use_replica = (
+        ReadSessionLocal is not None
+        and not await read_your_writes.recently_wrote(user_id)
+        and await replica_monitor.is_usable()
+    )
+    if use_replica:
+        return ReadSessionLocal, "replica"
+    return SessionLocal, "primary"
+
+
+async def get_write_session(
+    user: User = Depends(get_current_user),
+) -> AsyncIterator[AsyncSession]:
+    """
+    Сессия primary для пишущих эндпоинтов. Пользователь отмечается
+    до записи, поэтому его следующие чтения гарантированно идут в primary
+    (лишняя отметка при неудачной записи безопасна).
+    """
+    await read_your_writes.mark_write(user.id)
+    async with SessionLocal() as session:
+        yield session
+
+
+async def get_read_session(
+    request: Request,
+    user: User = Depends(get_current_user),
+) -> AsyncIterator[AsyncSession]:
+    """Сессия для read-only эндпоинтов (см. choose_read_sessionmaker)"""
+    session_factory, request.state.db_route = await choose_read_sessionmaker(user.id)
+    async with session_factory() as session:
+        yield session
@@ -1,14 +1,45 @@
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from src.core.settings import get_settings
+from src.adapters.http.client import http_clients, aclose_http_client
+from src.adapters.http.role_cache import role_members_cache
+from src.adapters.redis.client import aclose_redis_client
+from src.core.db import engine, read_engine, warmup_engine
+from src.core.lifecycle import lifecycle, install_drain_signal_handler
+from src.core.settings import get_settings, install_reload_signal_handler
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = get_settings()
+    install_reload_signal_handler()
+
+    # Прогрев: соединения с БД, HTTP клиенты, горячие кэши
+    await http_clients.startup()
+    try:
+        await warmup_engine(settings.db.WARMUP_CONNECTIONS)
+    except Exception:
+        logger.warning("Не удалось прогреть пул БД", exc_info=True)
+    await role_members_cache.preload()
+    lifecycle.mark_ready()
+    install_drain_signal_handler(settings.http.DRAIN_GRACE_S)
     try:
         yield
     finally:
-        pass
+        # Сервер уже не принимает соединения; остаток запросов — до дедлайна
+        lifecycle.stop_accepting()
+        if not await lifecycle.wait_idle(settings.http.DRAIN_TIMEOUT_S):
+            logger.warning(
+                "Drain не завершён за %s с, в обработке: %s",
+                settings.http.DRAIN_TIMEOUT_S,
+                lifecycle.in_flight,
+            )
+        await aclose_http_client()
+        await aclose_redis_client()
+        await engine.dispose()
+        if read_engine is not None:
+            await read_engine.dispose()
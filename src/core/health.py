@@ -0,0 +1,91 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from src.adapters.http.directory_cache import directory_cache
+from src.adapters.http.resilience import users_service_resilience
+from src.adapters.redis.client import get_redis_client
+from src.core.db import engine, read_engine
+from src.core.db_instrumentation import compiled_cache_stats
+from src.core.db_routing import replica_monitor
+from src.core.db_pool import pool_stats
+from src.core.lifecycle import lifecycle
+from src.core.settings import get_settings
+
+router = APIRouter(tags=["health"])
+
+
+async def _check_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _check_redis() -> None:
+    await get_redis_client().ping()
+
+
+async def _probe(check: Callable[[], Awaitable[None]]) -> dict:
+    """Выполняет проверку зависимости и замеряет её задержку"""
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(
+            check(), timeout=get_settings().http.READINESS_CHECK_TIMEOUT_S
+        )
+        ok, error = True, None
+    except Exception as e:
+        ok, error = False, repr(e)
+    return {
+        "ok": ok,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        "error": error,
+    }
+
+
+@router.get("/healthz")
+async def healthz():
+    """Liveness: процесс жив и обслуживает event loop"""
+    return {
+        "status": "ok",
+        "draining": lifecycle.draining,
+        "in_flight": lifecycle.in_flight,
+        "database_pool": pool_stats(engine.pool),
+        "replica_pool": pool_stats(read_engine.pool) if read_engine else None,
+        "compiled_cache": compiled_cache_stats.stats(),
+        "users_service": users_service_resilience.stats(),
+        "directory_cache": directory_cache.stats(),
+    }
+
+
+@router.get("/readyz")
+async def readyz():
+    """Readiness: прогрев завершён и зависимости отвечают"""
+    database, redis = await asyncio.gather(
+        _probe(_check_database), _probe(_check_redis)
+    )
+    ready = lifecycle.ready and not lifecycle.draining and database["ok"]
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "draining": lifecycle.draining,
+            "dependencies": {
+                "database": database,
+                "replica": {
+                    "configured": read_engine is not None,
+                    "usable": await replica_monitor.is_usable(),
+                    "lag_s": replica_monitor.lag_s,
+                },
+                "redis": redis,
+                "users_service": {
+                    "breaker_state": users_service_resilience.breaker.state,
+                    "latency_p95_ms": round(
+                        users_service_resilience.latency.p95() * 1000, 2
+                    ),
+                },
+            },
+        },
+    )
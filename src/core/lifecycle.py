@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import os
+import signal
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """
+    Состояние воркера для probes и graceful drain:
+    ready — прогрев завершён; draining — readiness снят, но запросы ещё
+    обслуживаются, пока балансировщик убирает воркер; rejecting — новые
+    запросы получают 503.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.rejecting = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def mark_ready(self) -> None:
+        self.ready = True
+
+    def start_draining(self) -> None:
+        self.ready = False
+        self.draining = True
+
+    def stop_accepting(self) -> None:
+        self.start_draining()
+        self.rejecting = True
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight <= 0:
+            self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Ждёт завершения обрабатываемых запросов; False — вышли по дедлайну"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+lifecycle = Lifecycle()
+
+
+def install_drain_signal_handler(grace_s: float) -> None:
+    """
+    SIGTERM сначала снимает readiness, а серверу (uvicorn) передаётся
+    через grace_s: пока балансировщик убирает воркер, тот ещё отвечает.
+    Lifespan shutdown uvicorn запускает только после остановки приёма
+    соединений, поэтому drain оттуда начинать поздно.
+    """
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def _hand_over(signum, frame) -> None:
+        lifecycle.stop_accepting()
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.signal(signal.SIGTERM, previous)
+            os.kill(os.getpid(), signum)
+
+    def _handle(signum, frame) -> None:
+        if lifecycle.draining:
+            # повторный SIGTERM — не ждём
+            _hand_over(signum, frame)
+            return
+        lifecycle.start_draining()
+        logger.info("SIGTERM: readiness снят, остановка через %s с", grace_s)
+        loop.call_soon_threadsafe(loop.call_later, grace_s, _hand_over, signum, frame)
+
+    try:
+        signal.signal(signal.SIGTERM, _handle)
+    except ValueError:
+        # не главный поток
+        logger.info("Обработчик SIGTERM для drain не установлен")
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from src.adapters.http.user_client import User
+from src.adapters.redis.client import get_redis_client, cache_key
+from src.common.cache import SingleFlight
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Ответы сервиса пользователей, которые кэшируются как «промах» (negative caching)
+NEGATIVE_STATUS_CODES = {401, 403, 404}
+
+
+class SessionUserCache:
+    """
+    Кэш SESSION -> User в Redis.
+    - положительный ответ живёт DEFAULT_TTL_S, отрицательный — NEGATIVE_TTL_S;
+    - конкурентные запросы одной сессии в воркере склеиваются в один fetch;
+    - при недоступности Redis ходим в сервис пользователей напрямую.
+    """
+
+    def __init__(self):
+        self._flight: SingleFlight[str, User] = SingleFlight()
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        # сам токен сессии в Redis не храним
+        digest = hashlib.sha256(session_id.encode()).hexdigest()
+        return cache_key("session", digest)
+
+    async def get_or_fetch(
+        self, session_id: str, fetch: Callable[[], Awaitable[User]]
+    ) -> User:
+        key = self._key(session_id)
+        return await self._flight.do(key, lambda: self._load(key, fetch))
+
+    async def evict(self, session_id: str) -> None:
+        """Удаляет сессию из кэша (logout / отзыв сессии)"""
+        key = self._key(session_id)
+        self._flight.forget(key)
+        try:
+            await get_redis_client().delete(key)
+        except RedisError:
+            logger.warning("Не удалось удалить сессию из кэша", exc_info=True)
+
+    async def _load(self, key: str, fetch: Callable[[], Awaitable[User]]) -> User:
+        cached = await self._read(key)
+        if cached is not None:
+            if "error" in cached:
+                raise HTTPException(**cached["error"])
+            return User.model_validate(cached["user"])
+
+        settings = get_settings()
+        try:
+            user = await fetch()
+        except HTTPException as e:
+            if e.status_code in NEGATIVE_STATUS_CODES:
+                await self._write(
+                    key,
+                    {"error": {"status_code": e.status_code, "detail": e.detail}},
+                    settings.redis.NEGATIVE_TTL_S,
+                )
+            raise
+
+        await self._write(
+            key, {"user": user.model_dump(mode="json")}, settings.redis.DEFAULT_TTL_S
+        )
+        return user
+
+    async def _read(self, key: str) -> Optional[dict]:
+        try:
+            raw = await get_redis_client().get(key)
+        except RedisError:
+            logger.warning("Кэш сессий недоступен", exc_info=True)
+            return None
+        return json.loads(raw) if raw else None
+
+    async def _write(self, key: str, value: dict, ttl: int) -> None:
+        try:
+            await get_redis_client().set(key, json.dumps(value), ex=ttl)
+        except RedisError:
+            logger.warning("Не удалось записать сессию в кэш", exc_info=True)
+
+
+session_user_cache = SessionUserCache()
@@ -1,15 +1,42 @@
+import asyncio
+import logging
+import signal
+import threading
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import ValidationError, BaseModel, AnyUrl, Field, field_validator
+from pydantic import (
+    ValidationError,
+    BaseModel,
+    AnyUrl,
+    Field,
+    field_validator,
+    model_validator,
+    ConfigDict,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FrozenModel(BaseModel):
+    """Группа настроек — часть неизменяемого снимка"""
 
+    model_config = ConfigDict(frozen=True)
 
-class HttpServer(BaseModel):
+
+class HttpServer(FrozenModel):
     """Параметры API сервера (uvicorn/gunicorn)"""
 
     HOST: str = "127.0.0.1"
     PORT: int = 8000
     RELOAD: bool = False
+    # сколько ждать завершения обрабатываемых запросов на shutdown
+    DRAIN_TIMEOUT_S: float = 20.0
+    # от SIGTERM до остановки сервера: /readyz уже 503, запросы ещё принимаются
+    DRAIN_GRACE_S: float = 5.0
+    READINESS_CHECK_TIMEOUT_S: float = 2.0
 
-class Database(BaseModel):
+class Database(FrozenModel):
     """База данных"""
 
     POSTGRES_SERVER: str
@@ -19,38 +46,132 @@ class Database(BaseModel):
     POSTGRES_PASSWORD: str
     database_url: str = ""
     ECHO: bool = False
+    # соединения, открываемые заранее на старте воркера
+    WARMUP_CONNECTIONS: int = 5
+
+    POOL_SIZE: int = 10
+    MAX_OVERFLOW: int = 10
+    POOL_TIMEOUT_S: float = 10.0
+    POOL_RECYCLE_S: int = 1800
+    POOL_PRE_PING: bool = True
+    # кэш prepared statements asyncpg на соединение (0 — выключен)
+    STATEMENT_CACHE_SIZE: int = 256
+
+    # реплика только для чтения (пусто — все запросы идут в primary)
+    REPLICA_URL: str = ""
+    REPLICA_MAX_LAG_S: float = 5.0
+    REPLICA_CHECK_INTERVAL_S: float = 5.0
+    # после записи чтения пользователя идут в primary (read-your-writes)
+    READ_YOUR_WRITES_WINDOW_S: float = 10.0
+
+    # запросы дольше порога пишутся в лог (параметры скрываются)
+    SLOW_QUERY_MS: float = 200.0
+    QUERY_STATS_HEADERS: bool = False
+
+    @model_validator(mode="after")
+    def build_database_url(self):
+        if not self.database_url:
+            # модель заморожена, поэтому производное поле выставляем в обход frozen
+            object.__setattr__(
+                self,
+                "database_url",
+                f"postgresql+asyncpg://{self.POSTGRES_USER}:"
+                f"{self.POSTGRES_PASSWORD}@"
+                f"{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/"
+                f"{self.POSTGRES_DB}",
+            )
+        return self
+
+class HttpServiceLimits(FrozenModel):
+    """Пул соединений клиента одного внешнего сервиса"""
+
+    MAX_CONNECTIONS: int = 100
+    MAX_KEEPALIVE_CONNECTIONS: int = 20
+    KEEPALIVE_EXPIRY_S: float = 30.0
+    # требует установленного пакета h2 (httpx[http2])
+    HTTP2: bool = False
 
-class HttpClient(BaseModel):
+class HttpClient(FrozenModel):
     """Единые таймауты/ретраи для внешних HTTP клиентов (httpx)"""
 
     CONNECT_TIMEOUT_S: float = 2.0
     READ_TIMEOUT_S: float = 8.0
     WRITE_TIMEOUT_S: float = 8.0
+    POOL_TIMEOUT_S: float = 2.0
     POOL_LIMIT: int = 100
     RETRIES: int = 2
+    RETRY_BACKOFF_BASE_S: float = 0.05
+    RETRY_BACKOFF_MAX_S: float = 1.0
+
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_TIMEOUT_S: float = 10.0
+
+    # hedged-запросы: вторая копия после max(HEDGE_MIN_DELAY_S, p95)
+    HEDGE_ENABLED: bool = False
+    HEDGE_MIN_DELAY_S: float = 0.05
+    HEDGE_MIN_SAMPLES: int = 20
+
+    users: HttpServiceLimits = HttpServiceLimits()
+    files: HttpServiceLimits = HttpServiceLimits(
+        MAX_CONNECTIONS=20, MAX_KEEPALIVE_CONNECTIONS=5
+    )
+
+class UserDirectory(FrozenModel):
+    """Пакетная загрузка справочников (пользователи/организации/внешние пользователи)"""
+
+    BATCH_WINDOW_MS: float = 5.0
+    CHUNK_SIZE: int = 200
+    MAX_CONCURRENCY: int = 4
+
+class DirectoryCache(FrozenModel):
+    """Двухуровневый кэш справочников: LRU в процессе + общий Redis"""
 
-class Services(BaseModel):
+    L1_MAX_ITEMS: int = 10000
+    USERS_TTL_S: int = 300
+    ORGANIZATIONS_TTL_S: int = 3600
+    EXTERNAL_USERS_TTL_S: int = 900
+    # сколько ещё отдавать устаревшую запись, пока она обновляется в фоне
+    STALE_TTL_S: int = 3600
+
+class Services(FrozenModel):
     """Внешние сервисы"""
 
     USERS_SERVICE_URL: AnyUrl = "http://localhost:8001/api"
     FILES_SERVICE_URL: AnyUrl = "http://localhost:8002/api"
+    # техническая сессия для фоновых запросов (прогрев кэшей на старте)
+    USERS_SERVICE_SESSION: str | None = None
 
-class RedisCache(BaseModel):
+class RedisCache(FrozenModel):
     """Redis ля кэширования токенов сессий и др"""
 
     URL: str = "redis://127.0.0.1:6379/0"
     NAMESPACE: str = "default"
     DEFAULT_TTL_S: int = 300
+    NEGATIVE_TTL_S: int = 15
+    ROLE_MEMBERS_TTL_S: int = 60
 
-class Pagination(BaseModel):
+class Pagination(FrozenModel):
     DEFAULT_LIMIT: int = 15
     MAX_LIMIT: int = 50
+    # как считать total, если клиент не указал count (см. CountMode)
+    COUNT_MODE: Literal["exact", "approximate", "cached", "none"] = "exact"
+    COUNT_CACHE_TTL_S: int = 60
+    # подсказки (select связки): потолок выдачи и время ответа БД
+    TYPEAHEAD_MAX_LIMIT: int = 20
+    TYPEAHEAD_TIMEOUT_MS: int = 500
+
+
+class Export(FrozenModel):
+    # строк на пачку серверного курсора (и на один запрос к справочникам)
+    BATCH_SIZE: int = 1000
+    MAX_PERIOD_DAYS: int = 366
+
 
 class Settings(BaseSettings):
     """Главные настройки"""
 
     model_config = SettingsConfigDict(
-        env_file=".env", env_nested_delimiter="__", extra="ignore"
+        env_file=".env", env_nested_delimiter="__", extra="ignore", frozen=True
     )
 
     DEBUG: bool = False
@@ -62,19 +183,11 @@ class Settings(BaseSettings):
     db: Database
     http_client:HttpClient = HttpClient()
     services: Services = Services()
+    user_directory: UserDirectory = UserDirectory()
+    directory_cache: DirectoryCache = DirectoryCache()
     redis: RedisCache = RedisCache()
     pagination: Pagination = Pagination()
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-        if not self.db.database_url:
-            self.db.database_url = (
-                f"postgresql+asyncpg://{self.db.POSTGRES_USER}:"
-                f"{self.db.POSTGRES_PASSWORD}@"
-                f"{self.db.POSTGRES_SERVER}:{self.db.POSTGRES_PORT}/"
-                f"{self.db.POSTGRES_DB}"
-            )
+    export: Export = Export()
 
     def validate_required(self) -> None:
         """Явная проверка критичных параметров при старте"""
@@ -82,10 +195,53 @@ class Settings(BaseSettings):
 
 
 
-def get_settings() -> Settings:
+_settings: Settings | None = None
+_settings_lock = threading.Lock()
+
+
+def _build_settings() -> Settings:
     s = Settings()
     try:
         s.validate_required()
     except ValidationError as e:
         raise
-    return s
\ No newline at end of file
+    return s
+
+
+def get_settings() -> Settings:
+    """
+    Процессный неизменяемый снимок настроек.
+    Окружение и .env читаются один раз; повторные вызовы бесплатны.
+    """
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                reload_settings()
+    return _settings
+
+
+def reload_settings() -> Settings:
+    """
+    Перечитать окружение и .env и атомарно подменить снимок.
+    Значения, прочитанные через get_settings() в момент вызова (таймауты, TTL,
+    флаги), подхватываются сразу; пулы БД и HTTP клиенты — после перезапуска.
+    """
+    global _settings
+    _settings = _build_settings()
+    return _settings
+
+
+def install_reload_signal_handler() -> None:
+    """Перечитывать настройки по SIGHUP (не поддерживается на Windows)"""
+
+    def _reload() -> None:
+        try:
+            reload_settings()
+            logger.info("Настройки перечитаны по SIGHUP")
+        except Exception:
+            logger.exception("Не удалось перечитать настройки, оставлен старый снимок")
+
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _reload)
+    except (NotImplementedError, AttributeError, RuntimeError):
+        logger.info("Обработчик SIGHUP не установлен")
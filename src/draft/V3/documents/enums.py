@@ -68,3 +68,19 @@ class DocumentLinkTypeEnum(EnumData):
 
     RELATED = "RELATED"
     ANSWER_TO = "ANSWER_TO"
+
+
+class DocumentVisibilityReasonEnum(EnumData):
+    """Почему пользователь видит документ в списке"""
+
+    CREATOR = "CREATOR"
+    ADDRESS = "ADDRESS"
+    ACCESS = "ACCESS"
+    PARTICIPANT = "PARTICIPANT"
+
+
+class ExportFormatEnum(EnumData):
+    """Формат выгрузки реестра"""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
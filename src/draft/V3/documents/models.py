@@ -11,9 +11,11 @@ from sqlalchemy import (
     ForeignKey,
     UUID,
     Boolean,
+    Computed,
     literal_column,
 )
-from sqlalchemy.orm import mapped_column, Mapped, relationship, column_property
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import mapped_column, Mapped, relationship, query_expression
 
 from src.common.db.mixins import BasicFieldsMixin
 from src.core.db import Base
@@ -24,6 +26,7 @@ from src.modules.documents.enums import (
     DocumentConfidentialTypeEnum,
     DocumentAccessTypeEnum,
     DocumentLinkTypeEnum,
+    DocumentVisibilityReasonEnum,
 )
 from src.modules.registration.models import RegistrationNumber
 
@@ -34,7 +37,14 @@ class Document(Base, BasicFieldsMixin):
     """Документ"""
 
     __tablename__ = "documents_document"
-    __table_args__ = (Index("ix_documents_document_type", "document_type"),)
+    __table_args__ = (
+        Index("ix_documents_document_type", "document_type"),
+        # порядок списков и keyset-пагинация: ORDER BY created_at DESC, id DESC
+        Index("ix_documents_document_created_at_id", "created_at", "id"),
+        Index(
+            "ix_documents_document_content_tsv", "content_tsv", postgresql_using="gin"
+        ),
+    )
 
     document_type: Mapped[str] = mapped_column(
         "document_type",
@@ -49,6 +59,14 @@ class Document(Base, BasicFieldsMixin):
     system_number: Mapped[str] = mapped_column(String(25), nullable=True)
 
     content: Mapped[str] = mapped_column("content", Text())
+    # поисковый вектор содержания; вычисляет и индексирует сама БД
+    content_tsv: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('russian'::regconfig, coalesce(content, ''))", persisted=True
+        ),
+        deferred=True,
+    )
     paper_count: Mapped[int] = mapped_column("paper_count", Integer(), default=1)
     attachment_description: Mapped[str] = mapped_column(
         "attachment_description", String(100), nullable=True
@@ -58,7 +76,14 @@ class Document(Base, BasicFieldsMixin):
     # Additional fields
     deadline: Mapped[datetime] = mapped_column("deadline", DateTime(), nullable=True)
 
-    document_status = column_property(literal_column("'UNKNOWN'"))
+    # растёт при любом изменении документа, его дочерних строк и статусов
+    # (см. documents.versioning); из неё строится ETag карточки
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+
+    # подставляется через with_expression из workflow_document_user_status
+    document_status = query_expression(literal_column("'UNKNOWN'"))
 
     links_in = relationship(
         "DocumentLink",
@@ -73,6 +98,15 @@ class DocumentRegistration(Base, BasicFieldsMixin, RefDocumentMixin):
     """Регистрационные данные документа"""
 
     __tablename__ = "document_document_registration"
+    __table_args__ = (
+        Index("idx_doc_reg_external_number", "external_registration_number"),
+        Index(
+            "idx_doc_reg_external_number_trgm",
+            "external_registration_number",
+            postgresql_using="gin",
+            postgresql_ops={"external_registration_number": "gin_trgm_ops"},
+        ),
+    )
     __document_backref__ = "registration"
     __document_backref_kwargs__ = {
         "cascade": "all, delete-orphan",
@@ -206,3 +240,45 @@ class DocumentLink(Base, BasicFieldsMixin, RefDocumentMixin):
     target: Mapped["Document"] = relationship(
         "Document", foreign_keys=[target_id], back_populates="links_in"
     )
+
+
+class DocumentVisibility(Base):
+    """
+    Кто видит документ в списке и почему. Поддерживается при изменении
+    создателя, адресатов, доступов и участников маршрута (documents.visibility).
+    created_at — дата документа: список пользователя читается одним
+    диапазоном индекса (user_id, created_at, document_id).
+    """
+
+    __tablename__ = "documents_document_visibility"
+    __table_args__ = (
+        Index(
+            "ix_documents_document_visibility_user_created",
+            "user_id",
+            "created_at",
+            "document_id",
+        ),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("documents_document.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    reason: Mapped[str] = mapped_column(
+        Enum(
+            DocumentVisibilityReasonEnum,
+            name="document_visibility_reason_enum",
+            native_enum=True,
+            validate_strings=True,
+        ),
+        primary_key=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    # срок временного доступа (reason=ACCESS); проверяется при чтении списка,
+    # поэтому истёкший доступ пропадает без пересчёта строк
+    expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
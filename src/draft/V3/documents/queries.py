@@ -0,0 +1,394 @@
+import uuid
+from functools import cache
+
+from sqlalchemy import (
+    Select,
+    select,
+    func,
+    or_,
+    bindparam,
+    union,
+    String,
+    literal_column,
+    Integer,
+    Text,
+    UUID,
+    DateTime,
+)
+from sqlalchemy.orm import (
+    with_expression,
+    configure_mappers,
+    load_only,
+    joinedload,
+    selectinload,
+    raiseload,
+)
+
+from src.common.db.utils import escape_like
+from src.common.pagination import keyset_after
+from src.modules.documents.enums import DocumentTypeEnum
+from src.modules.documents.models import (
+    Document,
+    DocumentRegistration,
+    DocumentAddress,
+    DocumentConfidential,
+    DocumentFiles,
+    DocumentVisibility,
+)
+
+# вместе с document_list_counter подключаются слушатели сессии visibility
+from src.modules.documents.visibility import document_list_counter
+from src.modules.documents import versioning  # noqa: F401 — слушатель after_flush
+from src.modules.registration.models import RegistrationNumber
+from src.modules.workflow.models import DocumentUserStatus
+from src.modules.workflow.utils import CURRENT_USER_ID
+
+# Все значения — bind-параметры, поэтому каждый запрос строится один раз,
+# а его cache key и текст SQL одинаковы для любых пользователей и страниц
+LIMIT = bindparam("limit", type_=Integer)
+OFFSET = bindparam("offset", type_=Integer)
+DOCUMENT_ID = bindparam("document_id", type_=UUID(as_uuid=True))
+CURSOR_CREATED_AT = bindparam("cursor_created_at", type_=DateTime(timezone=True))
+CURSOR_ID = bindparam("cursor_id", type_=UUID(as_uuid=True))
+SEARCH_QUERY = bindparam("search_query", type_=Text)
+
+# Та же конфигурация, что у Computed-колонки Document.content_tsv
+RUSSIAN = literal_column("'russian'::regconfig")
+# websearch-синтаксис: слова, "фраза", -исключение, or
+SEARCH_TSQUERY = func.websearch_to_tsquery(RUSSIAN, SEARCH_QUERY)
+PREFIX_TSQUERY = bindparam("prefix_tsquery", type_=Text)
+NUMBER_PATTERN = bindparam("number_pattern", type_=String)
+# trgm-индекс помогает ILIKE '%...%' только от трёх символов (одна триграмма)
+MIN_NUMBER_PATTERN_LENGTH = 3
+DOCUMENT_TYPES = bindparam("document_types", expanding=True)
+DATE_FROM = bindparam("date_from", type_=DateTime(timezone=True))
+DATE_TO = bindparam("date_to", type_=DateTime(timezone=True))
+# совпадения отмечаются управляющими символами, а не разметкой: содержание
+# документа — пользовательский текст, HTML собирается в render_headline
+HEADLINE_START, HEADLINE_STOP = "\x02", "\x03"
+HEADLINE_OPTIONS = bindparam(
+    "headline_options",
+    f"MaxFragments=2, MinWords=5, MaxWords=20, "
+    f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}",
+    type_=Text,
+)
+
+
+def _documents_with_status() -> Select:
+    # статус пользователя — одна строка workflow_document_user_status по PK
+    return (
+        select(Document)
+        .outerjoin(
+            DocumentUserStatus,
+            (DocumentUserStatus.document_id == Document.id)
+            & (DocumentUserStatus.user_id == CURRENT_USER_ID),
+        )
+        .options(with_expression(Document.document_status, DocumentUserStatus.status))
+    )
+
+
+@cache
+def document_list_options() -> tuple:
+    """
+    Загрузка только того, что читает DocumentListItem.
+    Страница — всегда 4 запроса: документы с регистрацией (JOIN),
+    адресаты, уровни секретности и файлы (selectin по id страницы).
+    Любое другое отношение поднимает ошибку вместо скрытого lazy load.
+    """
+    # коллекции-backref'и у Document появляются после настройки мапперов
+    configure_mappers()
+    return (
+        load_only(
+            Document.document_type,
+            Document.content,
+            Document.created_at,
+            Document.creator_id,
+            Document.paper_count,
+            Document.attachment_description,
+            Document.deadline,
+            Document.version,
+            raiseload=True,
+        ),
+        joinedload(Document.registration).options(
+            load_only(
+                DocumentRegistration.external_registration_number,
+                DocumentRegistration.external_registration_at,
+                raiseload=True,
+            ),
+            joinedload(DocumentRegistration.registration_number).options(
+                load_only(
+                    # full_name читает full_number
+                    RegistrationNumber.full_number,
+                    RegistrationNumber.registrator,
+                    RegistrationNumber.created_at,
+                    raiseload=True,
+                ),
+                raiseload("*"),
+            ),
+            raiseload("*"),
+        ),
+        selectinload(Document.address_parties).options(
+            load_only(
+                DocumentAddress.party_type,
+                DocumentAddress.user_id,
+                DocumentAddress.external_user_id,
+                DocumentAddress.organization_id,
+                raiseload=True,
+            ),
+            raiseload("*"),
+        ),
+        selectinload(Document.confidentials).options(
+            load_only(DocumentConfidential.confidential, raiseload=True),
+            raiseload("*"),
+        ),
+        selectinload(Document.files).options(
+            load_only(
+                DocumentFiles.name,
+                DocumentFiles.created_at,
+                DocumentFiles.size,
+                DocumentFiles.extension,
+                DocumentFiles.is_main,
+                raiseload=True,
+            ),
+            raiseload("*"),
+        ),
+        raiseload("*"),
+    )
+
+
+@cache
+def _visible_documents():
+    """
+    Документы, видимые пользователю: диапазон индекса
+    (user_id, created_at, document_id); повторы по разным reason схлопываются
+    GROUP BY, который идёт в порядке того же индекса
+    """
+    return (
+        select(DocumentVisibility.document_id, DocumentVisibility.created_at)
+        .where(DocumentVisibility.user_id == CURRENT_USER_ID)
+        .where(
+            or_(
+                DocumentVisibility.expires_at.is_(None),
+                DocumentVisibility.expires_at > func.now(),
+            )
+        )
+        .group_by(DocumentVisibility.created_at, DocumentVisibility.document_id)
+        .subquery("visible")
+    )
+
+
+@cache
+def document_list_statement(keyset: bool = False) -> Select:
+    """
+    Страница списка; параметры: current_user_id, limit и
+    offset (постранично) либо cursor_created_at, cursor_id (keyset=True)
+    """
+    visible = _visible_documents()
+    query = (
+        _documents_with_status()
+        .join(visible, visible.c.document_id == Document.id)
+        .options(*document_list_options())
+        .order_by(visible.c.created_at.desc(), visible.c.document_id.desc())
+    )
+    if keyset:
+        return query.where(
+            keyset_after(
+                visible.c.created_at,
+                visible.c.document_id,
+                CURSOR_CREATED_AT,
+                CURSOR_ID,
+            )
+        ).limit(LIMIT)
+    return query.limit(LIMIT).offset(OFFSET)
+
+
+@cache
+def document_count_rows() -> Select:
+    """
+    Строки списка для подсчёта total: те же фильтры, но без статуса,
+    selectin-загрузок и сортировки; параметры: current_user_id
+    """
+    return select(_visible_documents().c.document_id)
+
+
+@cache
+def document_search_statement() -> Select:
+    """
+    Поиск по содержанию среди видимых документов, по убыванию релевантности.
+    Строки: (Document, headline, rank); параметры: current_user_id,
+    search_query, limit, offset. Отбор идёт по GIN-индексу content_tsv,
+    ts_headline считается только для строк страницы.
+    """
+    visible = _visible_documents()
+    rank = func.ts_rank_cd(Document.content_tsv, SEARCH_TSQUERY)
+    # маркеры, встречающиеся в самом тексте, убираются до выделения
+    content = func.translate(Document.content, HEADLINE_START + HEADLINE_STOP, "")
+    headline = func.ts_headline(RUSSIAN, content, SEARCH_TSQUERY, HEADLINE_OPTIONS)
+    return (
+        _documents_with_status()
+        .add_columns(headline.label("headline"), rank.label("rank"))
+        .join(visible, visible.c.document_id == Document.id)
+        .where(Document.content_tsv.op("@@")(SEARCH_TSQUERY))
+        .options(*document_list_options())
+        .order_by(
+            rank.desc(), visible.c.created_at.desc(), visible.c.document_id.desc()
+        )
+        .limit(LIMIT)
+        .offset(OFFSET)
+    )
+
+
+@cache
+def document_search_count_rows() -> Select:
+    """Строки поиска для total; параметры: current_user_id, search_query"""
+    visible = _visible_documents()
+    return (
+        select(visible.c.document_id)
+        .join(Document, Document.id == visible.c.document_id)
+        .where(Document.content_tsv.op("@@")(SEARCH_TSQUERY))
+    )
+
+
+@cache
+def document_detail_statement() -> Select:
+    """Карточка документа; параметры: current_user_id, document_id"""
+    return _documents_with_status().where(Document.id == DOCUMENT_ID)
+
+
+@cache
+def document_version_statement() -> Select:
+    """Версия документа для ETag — один поиск по первичному ключу"""
+    return select(Document.version).where(Document.id == DOCUMENT_ID)
+
+
+def _prefix_tsquery(q: str) -> str:
+    """«вх пост» -> «вх:* & пост:*»: каждое слово как префикс"""
+    words = ["".join(ch for ch in word if ch.isalnum()) for word in q.split()]
+    return " & ".join(f"{word}:*" for word in words if word)
+
+
+def _matching_document_types(q: str) -> list[str]:
+    q = q.strip().lower()
+    return [
+        t.value
+        for t in DocumentTypeEnum
+        if t.get_russian_name().lower().startswith(q) or t.value.lower().startswith(q)
+    ]
+
+
+def _number_pattern(q: str) -> str | None:
+    """Шаблон части номера; для коротких запросов ветка номера не выполняется"""
+    q = q.strip()
+    if len(q) < MIN_NUMBER_PATTERN_LENGTH:
+        return None
+    return f"%{escape_like(q)}%"
+
+
+def document_select_params(q: str, limit: int, user_id: uuid.UUID) -> dict:
+    return {
+        "current_user_id": user_id,
+        "prefix_tsquery": _prefix_tsquery(q),
+        "number_pattern": _number_pattern(q),
+        "document_types": _matching_document_types(q),
+        "limit": limit,
+    }
+
+
+@cache
+def document_select_statement() -> Select:
+    """
+    Подсказки для выбора связки: префикс слов содержания (GIN content_tsv),
+    часть регистрационного номера от трёх символов (GIN trgm) или вид
+    документа.
+    Каждая ветка ограничена LIMIT, поэтому объём работы не растёт с таблицей.
+    Только видимые пользователю документы.
+    Параметры: document_select_params(q, limit, user_id).
+    """
+    configure_mappers()
+
+    def visible_only(query: Select) -> Select:
+        visible = _visible_documents()
+        return query.join(visible, visible.c.document_id == Document.id)
+
+    by_content = (
+        visible_only(select(Document.id, Document.created_at))
+        .where(Document.content_tsv.op("@@")(func.to_tsquery(RUSSIAN, PREFIX_TSQUERY)))
+        .order_by(Document.created_at.desc())
+        .limit(LIMIT)
+        .subquery()
+    )
+    by_number = (
+        visible_only(select(Document.id, Document.created_at))
+        .join(DocumentRegistration, DocumentRegistration.document_id == Document.id)
+        .join(
+            RegistrationNumber,
+            RegistrationNumber.id == DocumentRegistration.registration_number_id,
+        )
+        # без шаблона — One-Time Filter, индекс не читается
+        .where(NUMBER_PATTERN.is_not(None))
+        .where(RegistrationNumber.full_number.ilike(NUMBER_PATTERN, escape="\\"))
+        .order_by(Document.created_at.desc())
+        .limit(LIMIT)
+        .subquery()
+    )
+    by_type = (
+        visible_only(select(Document.id, Document.created_at))
+        .where(Document.document_type.in_(DOCUMENT_TYPES))
+        .order_by(Document.created_at.desc())
+        .limit(LIMIT)
+        .subquery()
+    )
+    candidates = union(
+        *(select(branch.c.id) for branch in (by_content, by_number, by_type))
+    ).subquery("candidates")
+    return (
+        select(Document)
+        .join(candidates, candidates.c.id == Document.id)
+        .options(
+            load_only(Document.document_type, Document.content, raiseload=True),
+            joinedload(Document.registration).options(
+                load_only(DocumentRegistration.registration_number_id, raiseload=True),
+                joinedload(DocumentRegistration.registration_number).options(
+                    load_only(
+                        RegistrationNumber.full_number,
+                        RegistrationNumber.created_at,
+                        raiseload=True,
+                    ),
+                    raiseload("*"),
+                ),
+                raiseload("*"),
+            ),
+            raiseload("*"),
+        )
+        .order_by(Document.created_at.desc(), Document.id.desc())
+        .limit(LIMIT)
+    )
+
+
+@cache
+def registration_journal_statement() -> Select:
+    """
+    Журнал регистрации за период [date_from, date_to) в порядке регистрации.
+    Только колонки: строки идут с серверного курсора без ORM-объектов.
+    """
+    return (
+        select(
+            RegistrationNumber.full_number,
+            RegistrationNumber.created_at.label("registered_at"),
+            RegistrationNumber.registrator,
+            Document.id,
+            Document.document_type,
+            Document.content,
+            Document.creator_id,
+            DocumentRegistration.external_registration_number,
+            DocumentRegistration.external_registration_at,
+        )
+        .join(DocumentRegistration, DocumentRegistration.document_id == Document.id)
+        .join(
+            RegistrationNumber,
+            RegistrationNumber.id == DocumentRegistration.registration_number_id,
+        )
+        .where(RegistrationNumber.created_at >= DATE_FROM)
+        .where(RegistrationNumber.created_at < DATE_TO)
+        .order_by(RegistrationNumber.created_at, RegistrationNumber.id)
+    )
@@ -1,25 +1,57 @@
+from datetime import date, datetime, time, timedelta, timezone
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, Form, Request
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import with_expression
 
 from src.adapters.http.user_client import User, UserClient
-from src.common.pagination import make_page, PageParams
+from src.adapters.http.directory_cache import directory_cache
+from src.common.pagination import make_page, PageParams, PageOut, Cursor
+from src.common.responses import (
+    FastJSONResponse,
+    etag_headers,
+    etag_matches,
+    not_modified,
+)
+from src.common.enum.user_roles import UserRolesEnum
 from src.core.auth import get_current_user
-from src.core.db import get_session
-from src.modules.documents.enums import DocumentTypesRequestEnum, DocumentTypeEnum
-from src.modules.documents.models import Document
+from src.core.db_routing import get_read_session, get_write_session
+from src.core.settings import get_settings
+from src.modules.documents.enums import (
+    DocumentTypesRequestEnum,
+    DocumentTypeEnum,
+    ExportFormatEnum,
+)
+from src.modules.documents.queries import (
+    document_list_statement,
+    document_count_rows,
+    document_detail_statement,
+    document_version_statement,
+    document_search_statement,
+    document_search_count_rows,
+    document_select_statement,
+    document_select_params,
+    document_list_counter,
+)
 from src.modules.documents.schemas.document_create import DocumentCreateSchema
 from src.modules.documents.schemas.document_list_item import (
     DocumentListItem,
 )
+from src.modules.documents.schemas.document_search import DocumentSearchHit
 from src.modules.documents.schemas.document_select import DocumentSelectOut
 from src.modules.documents.services.document_create import DocumentCreateService
 from src.modules.documents.services.orchestration_service import (
     DocumentOrchestrationService,
 )
+from src.modules.documents.serializers import (
+    render_headline,
+    serialize_document_list_item,
+)
+from src.modules.documents.services.registry_export import RegistryExportService
+from src.modules.documents.versioning import document_etag, page_etag
 from src.modules.documents.utils import collect_party_ids
 import asyncio, uuid
 
@@ -29,100 +61,244 @@ from src.modules.registration.actions.document_registration_action import (
 from src.modules.workflow.actions.workflow_activate_service import (
     WorkflowActivateService,
 )
-from src.modules.workflow.utils import document_status_expression
+from src.modules.workflow.utils import document_status_params
 
 router = APIRouter(prefix="/correspondence", tags=["documents"])
 
 
-@router.post("/list")
+@router.post(
+    "/list",
+    response_class=FastJSONResponse,
+    responses={200: {"model": PageOut[DocumentListItem]}},
+)
 async def get_documents(
     request: Request,
     page_params: PageParams = Depends(),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     user: User = Depends(get_current_user),
 ):
     """Контракт для получения списка документов у пользователя"""
 
-    expr = document_status_expression(user.id)
+    return await _documents_page(request, page_params, db, user, conditional=False)
+
+
+@router.get(
+    "/list",
+    response_class=FastJSONResponse,
+    responses={200: {"model": PageOut[DocumentListItem]}},
+)
+async def get_documents_conditional(
+    request: Request,
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user),
+):
+    """
+    То же, что POST /list, но с ETag: повторный опрос с If-None-Match
+    получает 304. Для POST 304 не определён (RFC 9110), поэтому условный
+    список — только здесь.
+    """
+
+    return await _documents_page(request, page_params, db, user, conditional=True)
+
 
-    query = select(Document).options(with_expression(Document.document_status, expr))
+async def _documents_page(
+    request: Request,
+    page_params: PageParams,
+    db: AsyncSession,
+    user: User,
+    conditional: bool,
+) -> Response:
+    params = document_status_params(user.id)
+
+    total = await document_list_counter.count(
+        db, page_params.count_mode, document_count_rows(), params, user_id=user.id
+    )
 
-    total = await db.scalar(select(func.count()).select_from(query.subquery()))
-    offset = (page_params.page - 1) * page_params.per_page
+    # одна лишняя строка показывает, есть ли следующая страница
+    list_params = {**params, "limit": page_params.per_page + 1}
+    if cursor := page_params.decoded_cursor:
+        list_params.update(cursor_created_at=cursor.created_at, cursor_id=cursor.id)
+    else:
+        list_params["offset"] = (page_params.page - 1) * page_params.per_page
 
     result = await db.execute(
-        query.order_by(Document.created_at.desc())
-        .offset(offset)
-        .limit(page_params.per_page)
+        document_list_statement(keyset=cursor is not None), list_params
     )
     docs = result.scalars().all()
+    next_cursor = None
+    if len(docs) > page_params.per_page:
+        docs = docs[: page_params.per_page]
+        next_cursor = Cursor(created_at=docs[-1].created_at, id=docs[-1].id).encode()
+
+    headers = None
+    if conditional:
+        # страница не изменилась — не ходим в справочники и не сериализуем
+        etag = page_etag(user.id, docs, total, page_params.page, next_cursor)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag)
+        headers = etag_headers(etag)
+
     user_ids, external_user_ids, org_ids = collect_party_ids(docs)
     user_client = UserClient(
         session_id=request.cookies.get("SESSION"),
     )
-    users, organizations, external_users = await asyncio.gather(
-        user_client.get_users(ids=user_ids),
-        user_client.get_organizations(ids=org_ids),
-        user_client.get_external_users(ids=external_user_ids),
+    context = await directory_cache.build_context(
+        user_client,
+        user_ids=user_ids,
+        organization_ids=org_ids,
+        external_user_ids=external_user_ids,
+    )
+    items = [serialize_document_list_item(d, context) for d in docs]
+
+    return FastJSONResponse(
+        make_page(
+            items,
+            total,
+            page_params.page,
+            page_params.per_page,
+            next_cursor,
+        ),
+        headers=headers,
+    )
+
+
+@router.post(
+    "/search",
+    response_class=FastJSONResponse,
+    responses={200: {"model": PageOut[DocumentSearchHit]}},
+)
+async def search_documents(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200),
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user),
+):
+    """Полнотекстовый поиск по содержанию документов (постранично, по релевантности)"""
+
+    params = {**document_status_params(user.id), "search_query": q}
+    total = await document_list_counter.count(
+        db,
+        page_params.count_mode,
+        document_search_count_rows(),
+        params,
+        user_id=user.id,
+        filters={"q": q},
+    )
+    result = await db.execute(
+        document_search_statement(),
+        {
+            **params,
+            "limit": page_params.per_page,
+            "offset": (page_params.page - 1) * page_params.per_page,
+        },
+    )
+    rows = result.all()
+    docs = [row[0] for row in rows]
+    user_ids, external_user_ids, org_ids = collect_party_ids(docs)
+    user_client = UserClient(
+        session_id=request.cookies.get("SESSION"),
+    )
+    context = await directory_cache.build_context(
+        user_client,
+        user_ids=user_ids,
+        organization_ids=org_ids,
+        external_user_ids=external_user_ids,
     )
     items = [
-        DocumentListItem.model_validate(
-            d,
-            from_attributes=True,
-            context={
-                "users": users,
-                "organizations": organizations,
-                "external_users": external_users,
-            },
-        )
-        for d in docs
+        {
+            "document": serialize_document_list_item(doc, context),
+            "headline": render_headline(headline),
+            "rank": rank,
+        }
+        for doc, headline, rank in rows
     ]
 
-    return make_page(
-        items,
-        total,
-        page_params.page,
-        page_params.per_page,
+    return FastJSONResponse(
+        make_page(items, total, page_params.page, page_params.per_page)
     )
 
 
-@router.get("/{id}/detail", response_model=DocumentListItem)
+@router.get("/export")
+async def export_registration_journal(
+    request: Request,
+    date_from: date = Query(..., description="Первый день периода"),
+    date_to: date = Query(..., description="Последний день периода (включительно)"),
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format"),
+    user: User = Depends(get_current_user),
+):
+    """Потоковая выгрузка журнала регистрации за период (NDJSON или CSV)"""
+
+    if UserRolesEnum.ROLE_VSM_DOCFLOW_REGISTRATOR.value not in user.roles:
+        raise HTTPException(status_code=403, detail="Недостаточно прав для выгрузки")
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to раньше date_from")
+    if (date_to - date_from).days >= get_settings().export.MAX_PERIOD_DAYS:
+        raise HTTPException(status_code=400, detail="Слишком длинный период")
+
+    service = RegistryExportService(
+        request=request,
+        user=user,
+        export_format=export_format,
+        date_from=datetime.combine(date_from, time.min, tzinfo=timezone.utc),
+        date_to=datetime.combine(
+            date_to + timedelta(days=1), time.min, tzinfo=timezone.utc
+        ),
+    )
+    filename = f"registry_{date_from}_{date_to}.{export_format.value}"
+    return StreamingResponse(
+        service.stream(),
+        media_type=service.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/{id}/detail",
+    response_class=FastJSONResponse,
+    responses={200: {"model": DocumentListItem}},
+)
 async def get_document_detail(
     id: uuid.UUID,
     request: Request,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     user: User = Depends(get_current_user),
 ):
     """Контракт для получения документа у пользователя"""
 
-    expr = document_status_expression(user.id)
+    # повторный опрос: сверяем только версию, без загрузки и справочников
+    if if_none_match := request.headers.get("if-none-match"):
+        version = await db.scalar(document_version_statement(), {"document_id": id})
+        if version is None:
+            raise HTTPException(status_code=404, detail="Документ не найден")
+        etag = document_etag(version, user.id)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
 
-    query = (
-        select(Document)
-        .where(Document.id == id)
-        .options(with_expression(Document.document_status, expr))
+    result = await db.execute(
+        document_detail_statement(),
+        {**document_status_params(user.id), "document_id": id},
     )
-    result = await db.execute(query)
     doc = result.scalars().first()
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Документ не найден")
 
     user_ids, external_user_ids, org_ids = collect_party_ids([doc])
     user_client = UserClient(
         session_id=request.cookies.get("SESSION"),
     )
-    users, organizations, external_users = await asyncio.gather(
-        user_client.get_users(ids=user_ids),
-        user_client.get_organizations(ids=org_ids),
-        user_client.get_external_users(ids=external_user_ids),
+    context = await directory_cache.build_context(
+        user_client,
+        user_ids=user_ids,
+        organization_ids=org_ids,
+        external_user_ids=external_user_ids,
     )
 
-    return DocumentListItem.model_validate(
-        doc,
-        from_attributes=True,
-        context={
-            "users": users,
-            "organizations": organizations,
-            "external_users": external_users,
-        },
+    # формат DocumentListItem без response_model: второй валидации нет
+    return FastJSONResponse(
+        serialize_document_list_item(doc, context),
+        headers=etag_headers(document_etag(doc.version, user.id)),
     )
 
 
@@ -134,7 +310,7 @@ async def create_new_document(
     data: Annotated[DocumentCreateSchema, Form()],
     request: Request,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_write_session),
 ):
 
     orchestration = DocumentOrchestrationService(
@@ -144,17 +320,35 @@ async def create_new_document(
         user=user,
     )
     await orchestration.execute(data)
-    print(1)
 
 
 @router.get("/select", response_model=List[DocumentSelectOut])
 async def get_link_selected_documents(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    """Контракт на получение списка документов при выборе связки"""
-    query = select(Document)
-    result = await db.execute(query.order_by(Document.created_at.desc()))
-    docs = result.scalars().all()
-
-    return docs
+    """
+    Контракт на получение документов при выборе связки (подсказки):
+    по началу слов содержания, части регистрационного номера или виду документа
+    """
+    # потолок и таймаут — из текущего снимка настроек (reload_settings)
+    settings = get_settings().pagination
+    if limit > settings.TYPEAHEAD_MAX_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit не больше {settings.TYPEAHEAD_MAX_LIMIT}",
+        )
+    timeout_ms = settings.TYPEAHEAD_TIMEOUT_MS
+    await db.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+    try:
+        result = await db.execute(
+            document_select_statement(), document_select_params(q, limit, user.id)
+        )
+    except DBAPIError as e:
+        # 57014 query_canceled: не уложились в бюджет
+        if getattr(e.orig, "sqlstate", None) == "57014":
+            raise HTTPException(status_code=504, detail="Поиск занял слишком долго")
+        raise
+    return result.scalars().all()
@@ -22,7 +22,13 @@ class DocumentAddressCreateModel(BaseModel):
             raise ValueError("Нужно указать хотя бы один идентификатор адресата.")
         return self
 
+
+# подписи считаются один раз, а не на каждый элемент списка
+DOC_TYPE_LABELS: dict[DocumentTypeEnum, str] = {
+    doc_type: doc_type.get_russian_name() for doc_type in DocumentTypeEnum
+}
+
 DocTypeLabel = Annotated[
     DocumentTypeEnum,
-    PlainSerializer(lambda v: v.get_russian_name(), return_type=str),
+    PlainSerializer(DOC_TYPE_LABELS.__getitem__, return_type=str),
 ]
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+from src.modules.documents.schemas.document_list_item import DocumentListItem
+
+
+class DocumentSearchHit(BaseModel):
+    """Результат полнотекстового поиска"""
+
+    document: DocumentListItem
+    # фрагменты содержания, экранированные для HTML; совпадения — в <b></b>
+    headline: str
+    rank: float
@@ -0,0 +1,139 @@
+import html
+from typing import Any, Iterable, Optional
+
+from src.modules.documents.enums import DocumentPartyTypeEnum
+from src.modules.documents.models import Document, DocumentFiles
+from src.modules.documents.queries import HEADLINE_START, HEADLINE_STOP
+from src.modules.documents.schemas.base import DOC_TYPE_LABELS
+
+# Статичные действия (в будущем можно передавать через context)
+ACTIONS = {
+    "approve": True,
+    "originality": True,
+    "registration": True,
+    "reject": True,
+    "revision": True,
+    "revoke": True,
+    "sign": True,
+    "registration_edit": True,
+    "assignment": True,
+}
+
+
+def _lookup(mapping: dict, value) -> Any:
+    return mapping.get(str(value)) or mapping.get(value)
+
+
+def _address_groups(parties: Iterable, context: dict) -> dict:
+    """То же, что AddressGroups.build_groups, но сразу в формат ответа"""
+    users_map = context.get("users") or {}
+    ext_map = context.get("external_users") or {}
+    orgs_map = context.get("organizations") or {}
+
+    users, external_users, organizations = [], [], []
+    seen_users, seen_ext, seen_orgs = set(), set(), set()
+    for party in parties:
+        uid, oid, xid = party.user_id, party.organization_id, party.external_user_id
+        if uid and uid not in seen_users:
+            seen_users.add(uid)
+            if user := _lookup(users_map, uid):
+                users.append(user)
+        if oid and not uid and not xid and oid not in seen_orgs:
+            seen_orgs.add(oid)
+            if organization := _lookup(orgs_map, oid):
+                organizations.append(organization)
+        if xid is not None and (xid, oid) not in seen_ext:
+            seen_ext.add((xid, oid))
+            external_users.append(
+                {
+                    "user": _lookup(ext_map, xid),
+                    "organization": _lookup(orgs_map, oid) if oid else None,
+                }
+            )
+    return {
+        "users": users,
+        "external_users": external_users,
+        "organizations": organizations,
+    }
+
+
+def _registration(registration) -> dict:
+    """То же, что RegistrationModel.from_orm_obj"""
+    number = registration.registration_number if registration else None
+    return {
+        "external_registration_number": getattr(
+            registration, "external_registration_number", None
+        ),
+        "external_registration_at": getattr(
+            registration, "external_registration_at", None
+        ),
+        "registration_number": number.full_name if number else None,
+        # RegistrationModel кладёт дату в registration_at, а поле называется at,
+        # поэтому в ответе оно всегда пустое — формат сохранён как есть
+        "at": None,
+        "registrator": None,
+        "is_registered": number is not None,
+    }
+
+
+def _file(file: DocumentFiles) -> dict:
+    return {
+        "id": file.id,
+        "name": file.name,
+        "created_at": file.created_at,
+        "size": file.size,
+        "extension": file.extension,
+        "type": file.extension,
+        "is_main": file.is_main,
+    }
+
+
+def render_headline(headline: str) -> str:
+    """Фрагменты ts_headline: текст экранируется, совпадения — в <b></b>"""
+    return (
+        html.escape(headline, quote=False)
+        .replace(HEADLINE_START, "<b>")
+        .replace(HEADLINE_STOP, "</b>")
+    )
+
+
+def serialize_document_list_item(doc: Document, context: dict) -> dict:
+    """
+    Элемент списка в формате DocumentListItem, собранный за один проход
+    по загруженным объектам, без валидации pydantic. Справочные записи
+    (User, Organization, ExternalUser) уже провалидированы в кеше
+    справочников и сериализуются как есть.
+    """
+    senders, recipients = [], []
+    for party in doc.address_parties:
+        if party.party_type == DocumentPartyTypeEnum.SENDER.value:
+            senders.append(party)
+        else:
+            recipients.append(party)
+
+    main_file: Optional[dict] = None
+    file_list = []
+    for file in doc.files:
+        if file.is_main:
+            main_file = main_file or _file(file)
+        else:
+            file_list.append(_file(file))
+
+    return {
+        "id": doc.id,
+        "document_type": DOC_TYPE_LABELS[doc.document_type],
+        "registration": _registration(doc.registration),
+        "sender": _address_groups(senders, context),
+        "recipient": _address_groups(recipients, context),
+        "content": doc.content,
+        "created_at": doc.created_at,
+        "creator": (context.get("users") or {}).get(str(doc.creator_id)),
+        "paper_count": doc.paper_count,
+        "attachment_count": doc.attachment_description,
+        "deadline": doc.deadline,
+        "actions": ACTIONS,
+        "confidentiality_level": [c.confidential for c in doc.confidentials],
+        "main_file": main_file,
+        "file_list": file_list,
+        "status": doc.document_status,
+    }
@@ -31,6 +31,7 @@ import uuid
 from src.modules.workflow.actions.workflow_initialize_action import (
     WorkflowInitializeAction,
 )
+from src.modules.workflow.status import document_status_projector
 
 
 class DocumentCreateService:
@@ -180,6 +181,8 @@ class DocumentCreateService:
                 workflow_data=data.workflow,
             )
             self.db.add(await workflow.execute())
+            # создатель видит статус первого шага сразу после создания
+            await document_status_projector.refresh(self.db, self.document_id)
 
             return document
         except Exception as e:
@@ -0,0 +1,67 @@
+import hashlib
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import Update, event, update
+from sqlalchemy.orm import Session
+
+from src.modules.documents._mixins import RefDocumentMixin
+from src.modules.documents.models import Document
+
+_documents = Document.__table__
+
+
+def bump_versions(document_ids: Iterable[uuid.UUID]) -> Update:
+    """UPDATE version = version + 1 для переданных документов"""
+    return (
+        update(_documents)
+        .where(_documents.c.id.in_(list(document_ids)))
+        .values(version=_documents.c.version + 1)
+    )
+
+
+def document_etag(version: int, user_id: uuid.UUID) -> str:
+    """
+    ETag карточки. Слабый: ФИО и организации приходят из справочников
+    и в версии не учитываются. Пользователь входит в тег, потому что
+    статус в ответе у каждого свой.
+    """
+    return f'W/"{version}-{user_id}"'
+
+
+def page_etag(user_id: uuid.UUID, docs: Iterable[Document], *extra) -> str:
+    """ETag страницы списка — хеш версий видимых на ней документов"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{user_id}|{extra}".encode())
+    for doc in docs:
+        digest.update(f"|{doc.id}:{doc.version}".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _document_id(obj) -> Optional[uuid.UUID]:
+    if isinstance(obj, Document):
+        return obj.id
+    if isinstance(obj, RefDocumentMixin):
+        return obj.document_id
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session: Session, flush_context) -> None:
+    # новым документам хватает version = 1, удалённым — нечего менять
+    skip = {
+        obj.id for obj in (*session.new, *session.deleted) if isinstance(obj, Document)
+    }
+    changed = [
+        obj
+        for obj in session.dirty
+        if session.is_modified(obj, include_collections=False)
+    ]
+    document_ids = {
+        document_id
+        for obj in (*session.new, *session.deleted, *changed)
+        if (document_id := _document_id(obj)) is not None
+    } - skip
+    if document_ids:
+        # объекты Document в сессии сохраняют прежнее значение version
+        session.connection().execute(bump_versions(document_ids))
@@ -0,0 +1,220 @@
+import asyncio
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    case,
+    cast,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    null,
+    or_,
+    select,
+    union,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.common.pagination import ListCounter
+from src.core.db import SessionLocal
+from src.modules.documents.enums import DocumentVisibilityReasonEnum
+from src.modules.documents.models import (
+    Document,
+    DocumentAddress,
+    DocumentAccess,
+    DocumentVisibility,
+)
+from src.modules.workflow.models import Workflow, WorkflowStep, WorkflowParticipant
+
+VISIBILITY_COLUMNS = ["user_id", "document_id", "reason", "created_at", "expires_at"]
+
+# total списков зависят от видимости и сбрасываются вместе с ней
+document_list_counter = ListCounter("documents")
+
+# Какие изменения влияют на видимость документа
+TRACKED_ATTRIBUTES = {
+    Document: ("creator_id",),
+    DocumentAddress: ("user_id", "document_id"),
+    DocumentAccess: ("user_id", "document_id", "expires_at"),
+    WorkflowParticipant: ("user_id", "workflow_step_id"),
+}
+
+
+def _reason(reason: DocumentVisibilityReasonEnum) -> ColumnElement:
+    return cast(
+        literal_column(f"'{reason.value}'"), DocumentVisibility.__table__.c.reason.type
+    )
+
+
+def _no_expiry() -> ColumnElement:
+    return cast(null(), DocumentVisibility.__table__.c.expires_at.type)
+
+
+def visibility_rows(document_ids: Optional[Iterable[uuid.UUID]] = None) -> Select:
+    """
+    Все строки видимости, вычисленные из исходных таблиц
+    (только для document_ids, если переданы)
+    """
+
+    def scoped(query: Select, column) -> Select:
+        if document_ids is None:
+            return query
+        return query.where(column.in_(list(document_ids)))
+
+    creator = scoped(
+        select(
+            Document.creator_id,
+            Document.id,
+            _reason(DocumentVisibilityReasonEnum.CREATOR),
+            Document.created_at,
+            _no_expiry(),
+        ).where(Document.creator_id.isnot(None)),
+        Document.id,
+    )
+    address = scoped(
+        select(
+            DocumentAddress.user_id,
+            DocumentAddress.document_id,
+            _reason(DocumentVisibilityReasonEnum.ADDRESS),
+            Document.created_at,
+            _no_expiry(),
+        )
+        .join(Document, Document.id == DocumentAddress.document_id)
+        .where(DocumentAddress.user_id.isnot(None)),
+        DocumentAddress.document_id,
+    )
+    # срок доступа переносится в строку и проверяется при чтении списка;
+    # из нескольких доступов пользователя действует самый долгий
+    access = scoped(
+        select(
+            DocumentAccess.user_id,
+            DocumentAccess.document_id,
+            _reason(DocumentVisibilityReasonEnum.ACCESS),
+            Document.created_at,
+            case(
+                (func.bool_or(DocumentAccess.expires_at.is_(None)), _no_expiry()),
+                else_=func.max(DocumentAccess.expires_at),
+            ),
+        )
+        .join(Document, Document.id == DocumentAccess.document_id)
+        .where(
+            or_(
+                DocumentAccess.expires_at.is_(None),
+                DocumentAccess.expires_at > func.now(),
+            )
+        )
+        .group_by(
+            DocumentAccess.user_id, DocumentAccess.document_id, Document.created_at
+        ),
+        DocumentAccess.document_id,
+    )
+    participant = scoped(
+        select(
+            WorkflowParticipant.user_id,
+            Workflow.document_id,
+            _reason(DocumentVisibilityReasonEnum.PARTICIPANT),
+            Document.created_at,
+            _no_expiry(),
+        )
+        .join(WorkflowStep, WorkflowStep.id == WorkflowParticipant.workflow_step_id)
+        .join(Workflow, Workflow.id == WorkflowStep.workflow_id)
+        .join(Document, Document.id == Workflow.document_id),
+        Workflow.document_id,
+    )
+    # UNION убирает повторы: один пользователь в нескольких адресах или шагах
+    return union(creator, address, access, participant)
+
+
+def refresh_visibility(connection: Connection, document_ids: set[uuid.UUID]) -> None:
+    """Пересчитывает видимость документов в текущей транзакции"""
+    connection.execute(
+        delete(DocumentVisibility).where(
+            DocumentVisibility.document_id.in_(list(document_ids))
+        )
+    )
+    connection.execute(
+        insert(DocumentVisibility).from_select(
+            VISIBILITY_COLUMNS, visibility_rows(document_ids)
+        )
+    )
+
+
+async def rebuild_visibility(db: AsyncSession) -> None:
+    """Полная перестройка таблицы одним INSERT ... SELECT"""
+    await db.execute(delete(DocumentVisibility))
+    await db.execute(
+        insert(DocumentVisibility).from_select(VISIBILITY_COLUMNS, visibility_rows())
+    )
+
+
+def _tracked_change(obj) -> bool:
+    if type(obj) not in TRACKED_ATTRIBUTES:
+        return False
+    state = inspect(obj)
+    return any(
+        state.attrs[name].history.has_changes()
+        for name in TRACKED_ATTRIBUTES[type(obj)]
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_after_flush(session: Session, flush_context) -> None:
+    document_ids: set[uuid.UUID] = set()
+    step_ids: set[uuid.UUID] = set()
+    # история атрибутов ещё доступна в after_flush
+    changed = [obj for obj in session.dirty if _tracked_change(obj)]
+    for obj in (*session.new, *session.deleted, *changed):
+        if type(obj) not in TRACKED_ATTRIBUTES:
+            continue
+        if isinstance(obj, Document):
+            # при удалении документа строки уйдут по ON DELETE CASCADE
+            if obj not in session.deleted:
+                document_ids.add(obj.id)
+        elif isinstance(obj, WorkflowParticipant):
+            step_ids.add(obj.workflow_step_id)
+        else:
+            document_ids.add(obj.document_id)
+
+    if not (document_ids or step_ids):
+        return
+    connection = session.connection()
+    if step_ids:
+        document_ids.update(
+            connection.scalars(
+                select(Workflow.document_id)
+                .join(WorkflowStep, WorkflowStep.workflow_id == Workflow.id)
+                .where(WorkflowStep.id.in_(list(step_ids)))
+            )
+        )
+    if document_ids:
+        refresh_visibility(connection, document_ids)
+        session.info["visibility_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_counts_after_commit(session: Session) -> None:
+    if session.info.pop("visibility_changed", False):
+        document_list_counter.invalidate_soon()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_visibility_changes(session: Session) -> None:
+    session.info.pop("visibility_changed", None)
+
+
+async def _main() -> None:
+    async with SessionLocal() as db, db.begin():
+        await rebuild_visibility(db)
+    await document_list_counter.invalidate()
+
+
+if __name__ == "__main__":
+    # python -m src.modules.documents.visibility
+    asyncio.run(_main())
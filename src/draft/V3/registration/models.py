@@ -1,4 +1,4 @@
-from sqlalchemy import String, UUID, Index
+from sqlalchemy import String, UUID, Index, Computed
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import uuid
 
@@ -14,6 +14,14 @@ class RegistrationNumber(Base, BasicFieldsMixin):
     prefix: Mapped[str] = mapped_column(String(20), nullable=True)
     number: Mapped[str] = mapped_column(String(20))
     postfix: Mapped[str] = mapped_column(String(20), nullable=True)
+    # «prefix-number/postfix» для поиска; вычисляется и индексируется в БД
+    full_number: Mapped[str] = mapped_column(
+        String(62),
+        Computed(
+            "coalesce(prefix, '') || '-' || number || '/' || coalesce(postfix, '')",
+            persisted=True,
+        ),
+    )
 
     registrator: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
 
@@ -23,11 +31,20 @@ class RegistrationNumber(Base, BasicFieldsMixin):
 
     @property
     def full_name(self) -> str:
-        return f"{self.prefix}-{self.number}/{self.postfix}"
+        # тот же номер, по которому ищут: без «None» при пустых частях
+        return self.full_number
 
     __table_args__ = (
         # Составные индексы для частых запросов
         Index("idx_reg_number_prefix_number", "prefix", "number"),
         Index("idx_reg_number_number_postfix", "number", "postfix"),
         Index("idx_reg_number_full", "prefix", "number", "postfix"),
+        # точный поиск и подсказки по частичному совпадению (pg_trgm)
+        Index("idx_reg_number_full_number", "full_number"),
+        Index(
+            "idx_reg_number_full_number_trgm",
+            "full_number",
+            postgresql_using="gin",
+            postgresql_ops={"full_number": "gin_trgm_ops"},
+        ),
     )
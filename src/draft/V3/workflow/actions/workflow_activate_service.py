@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.modules.workflow.enums import StatusEnum
 from src.modules.workflow.models import Workflow, WorkflowStep
+from src.modules.workflow.status import document_status_projector
 
 
 class WorkflowActivateService:
@@ -39,4 +40,5 @@ class WorkflowActivateService:
                 participant.status = StatusEnum.SENDED
                 participant.started_at = datetime.now()
             self.db.add(step)
+            await document_status_projector.refresh(self.db, self.document_id)
         return workflow
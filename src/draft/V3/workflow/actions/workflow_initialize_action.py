@@ -3,6 +3,7 @@ from typing import List, Optional
 from fastapi import Request
 from pydantic import BaseModel
 
+from src.adapters.http.role_cache import role_members_cache
 from src.adapters.http.user_client import UserClient
 from src.common.enum.user_roles import UserRolesEnum
 from src.modules.documents.enums import DocumentTypeEnum
@@ -46,8 +47,8 @@ class WorkflowInitializeAction:
         user_client = UserClient(
             session_id=self.request.cookies.get("SESSION"),
         )
-        registrators = await user_client.get_user_ids_from_role(
-            UserRolesEnum.ROLE_VSM_DOCFLOW_REGISTRATOR
+        registrators = await role_members_cache.get_user_ids(
+            user_client, UserRolesEnum.ROLE_VSM_DOCFLOW_REGISTRATOR
         )
         return registrators
 
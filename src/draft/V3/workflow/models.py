@@ -1,7 +1,16 @@
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import DateTime, Text, Boolean, Enum, UUID, ForeignKey, Integer
+from sqlalchemy import (
+    DateTime,
+    Text,
+    Boolean,
+    Enum,
+    UUID,
+    ForeignKey,
+    Integer,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.common.db.mixins import BasicFieldsMixin
@@ -125,3 +134,32 @@ class WorkflowParticipant(Base, BasicFieldsMixin):
     comment: Mapped[str] = mapped_column(Text, nullable=True)
     deadline: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
     is_responsible: Mapped[bool] = mapped_column(Boolean(), default=False)
+
+
+class DocumentUserStatus(Base):
+    """
+    Статус документа для конкретного пользователя (создателя или участника).
+    Денормализация: пишется в той же транзакции, что и переходы маршрута,
+    списки читают её одним JOIN по первичному ключу.
+    """
+
+    __tablename__ = "workflow_document_user_status"
+
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("documents_document.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    status: Mapped[str] = mapped_column(
+        Enum(
+            StatusEnum,
+            name="status_map_enum",
+            native_enum=True,
+            validate_strings=True,
+        ),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,202 @@
+import asyncio
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import select, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, lazyload
+
+from src.core.db import SessionLocal
+from src.modules.documents.models import Document
+from src.modules.documents.versioning import bump_versions
+from src.modules.workflow.models import Workflow, WorkflowStep, DocumentUserStatus
+
+
+def _desc_nulls_last(value: Optional[datetime]) -> tuple[bool, float]:
+    # ключ для max(): NULL меньше любой даты (ORDER BY ... DESC NULLS LAST)
+    return value is not None, value.timestamp() if value else 0.0
+
+
+def compute_document_statuses(
+    creator_id: Optional[uuid.UUID], steps: Iterable[WorkflowStep]
+) -> dict[uuid.UUID, str]:
+    """
+    Статус документа для каждого причастного пользователя.
+    Участник — статус последнего начатого из активных или завершённых шагов,
+    где он участвует. Создатель — статус текущего шага маршрута
+    (активного, иначе последнего завершённого); правило создателя главнее.
+    """
+    steps = list(steps)
+    statuses: dict[uuid.UUID, str] = {}
+    started: dict[uuid.UUID, tuple[bool, float]] = {}
+    for step in steps:
+        if not (step.is_active or step.finished_at is not None):
+            continue
+        key = _desc_nulls_last(step.started_at)
+        for participant in step.participants:
+            if participant.user_id not in started or key > started[participant.user_id]:
+                started[participant.user_id] = key
+                statuses[participant.user_id] = step.status
+
+    if creator_id and steps:
+        current = max(
+            steps, key=lambda s: (bool(s.is_active), _desc_nulls_last(s.finished_at))
+        )
+        statuses[creator_id] = current.status
+    return statuses
+
+
+@dataclass
+class StatusConsistencyReport:
+    documents: int = 0
+    missing: int = 0
+    stale: int = 0
+    extra: int = 0
+    fixed_documents: int = 0
+
+
+class DocumentStatusProjector:
+    """
+    Поддерживает workflow_document_user_status.
+    refresh() вызывается в той же транзакции после любого перехода маршрута
+    (активация, действия над шагами); check() сверяет и перестраивает таблицу.
+    """
+
+    async def refresh(self, db: AsyncSession, document_id: uuid.UUID) -> None:
+        # SessionLocal без autoflush: документ и переход маршрута должны
+        # попасть в БД до пересчёта, а строки статуса — после INSERT документа
+        await db.flush()
+        expected = await self._expected(db, [document_id])
+        stored = await self._stored(db, [document_id])
+        await self._write(db, expected, stored)
+
+    async def check(
+        self, db: AsyncSession, fix: bool = False, batch_size: int = 500
+    ) -> StatusConsistencyReport:
+        report = StatusConsistencyReport()
+        last_id: Optional[uuid.UUID] = None
+        while True:
+            query = select(Document.id).order_by(Document.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(Document.id > last_id)
+            ids = (await db.scalars(query)).all()
+            if not ids:
+                return report
+            last_id = ids[-1]
+            report.documents += len(ids)
+
+            expected = await self._expected(db, ids)
+            actual = await self._stored(db, ids)
+
+            broken = {}
+            for document_id in ids:
+                want, have = expected[document_id], actual[document_id]
+                missing = want.keys() - have.keys()
+                extra = have.keys() - want.keys()
+                stale = [u for u in want.keys() & have.keys() if want[u] != have[u]]
+                report.missing += len(missing)
+                report.extra += len(extra)
+                report.stale += len(stale)
+                if missing or extra or stale:
+                    broken[document_id] = want
+
+            if fix and broken:
+                await self._write(db, broken, actual)
+                report.fixed_documents += len(broken)
+
+    @staticmethod
+    async def _expected(
+        db: AsyncSession, document_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, dict[uuid.UUID, str]]:
+        creators = dict(
+            (
+                await db.execute(
+                    select(Document.id, Document.creator_id).where(
+                        Document.id.in_(document_ids)
+                    )
+                )
+            ).all()
+        )
+        steps_by_document: dict[uuid.UUID, list[WorkflowStep]] = {
+            id_: [] for id_ in document_ids
+        }
+        rows = await db.execute(
+            select(Workflow.document_id, WorkflowStep)
+            .join(Workflow, Workflow.id == WorkflowStep.workflow_id)
+            .where(Workflow.document_id.in_(document_ids))
+            .options(
+                selectinload(WorkflowStep.participants),
+                lazyload(WorkflowStep.workflow),
+            )
+        )
+        for document_id, step in rows:
+            steps_by_document[document_id].append(step)
+
+        return {
+            id_: compute_document_statuses(creators.get(id_), steps_by_document[id_])
+            for id_ in document_ids
+        }
+
+    @staticmethod
+    async def _stored(
+        db: AsyncSession, document_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, dict[uuid.UUID, str]]:
+        stored: dict[uuid.UUID, dict[uuid.UUID, str]] = {
+            id_: {} for id_ in document_ids
+        }
+        rows = await db.execute(
+            select(
+                DocumentUserStatus.document_id,
+                DocumentUserStatus.user_id,
+                DocumentUserStatus.status,
+            ).where(DocumentUserStatus.document_id.in_(document_ids))
+        )
+        for document_id, user_id, status in rows:
+            stored[document_id][user_id] = status
+        return stored
+
+    @staticmethod
+    async def _write(
+        db: AsyncSession,
+        statuses: dict[uuid.UUID, dict[uuid.UUID, str]],
+        stored: dict[uuid.UUID, dict[uuid.UUID, str]],
+    ) -> None:
+        """Переписывает строки только тех документов, где статусы изменились"""
+        changed = {
+            document_id: by_user
+            for document_id, by_user in statuses.items()
+            if by_user != stored.get(document_id, {})
+        }
+        if not changed:
+            return
+        await db.execute(
+            delete(DocumentUserStatus).where(
+                DocumentUserStatus.document_id.in_(list(changed))
+            )
+        )
+        rows = [
+            {"document_id": document_id, "user_id": user_id, "status": status}
+            for document_id, by_user in changed.items()
+            for user_id, status in by_user.items()
+        ]
+        if rows:
+            await db.execute(insert(DocumentUserStatus), rows)
+        # статус входит в карточку документа, поэтому меняет и её ETag;
+        # пересчёт без изменений версию не трогает
+        await db.execute(bump_versions(changed))
+
+
+document_status_projector = DocumentStatusProjector()
+
+
+async def _main(fix: bool) -> None:
+    async with SessionLocal() as db, db.begin():
+        print(await document_status_projector.check(db, fix=fix))
+
+
+if __name__ == "__main__":
+    # python -m src.modules.workflow.status [--fix]
+    asyncio.run(_main("--fix" in sys.argv))
@@ -0,0 +1,46 @@
+import json
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.lifecycle import lifecycle
+
+# probes отвечают и во время drain
+PROBE_PATHS = {"/healthz", "/readyz"}
+
+
+class InFlightMiddleware:
+    """
+    Считает обрабатываемые запросы и отклоняет новые во время drain.
+    Чистый ASGI (а не BaseHTTPMiddleware), чтобы запрос считался
+    обрабатываемым до конца отдачи тела, в том числе потокового.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in PROBE_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if lifecycle.rejecting:
+            body = json.dumps({"detail": "Сервис останавливается"}).encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"connection", b"close"),
+                        (b"retry-after", b"1"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        lifecycle.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lifecycle.request_finished()
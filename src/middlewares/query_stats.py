@@ -0,0 +1,49 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.db_instrumentation import collect_queries
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Число SQL запросов, время в БД и количество строк на HTTP запрос.
+    Пишется в лог и (при DB__QUERY_STATS_HEADERS) в заголовки X-DB-*.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with_headers = get_settings().db.QUERY_STATS_HEADERS
+        with collect_queries() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start" and with_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.queries)
+                    headers["X-DB-Time-Ms"] = f"{stats.total_time_s * 1000:.1f}"
+                    headers["X-DB-Rows"] = str(stats.rows)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                logger.info(
+                    "%s %s: %s SQL, %.1f мс, %s строк, compiled cache %s/%s",
+                    scope["method"],
+                    scope["path"],
+                    stats.queries,
+                    stats.total_time_s * 1000,
+                    stats.rows,
+                    stats.cache_hits,
+                    stats.cache_hits + stats.cache_misses,
+                )
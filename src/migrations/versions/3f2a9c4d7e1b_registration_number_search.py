@@ -0,0 +1,37 @@
+"""registration number search
+
+Revision ID: 3f2a9c4d7e1b
+Revises: 0ef80fa818aa
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c4d7e1b'
+down_revision: Union[str, Sequence[str], None] = '0ef80fa818aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('registration_registration_number', sa.Column('full_number', sa.String(length=62), sa.Computed("coalesce(prefix, '') || '-' || number || '/' || coalesce(postfix, '')", persisted=True), nullable=True))
+    op.create_index('idx_reg_number_full_number', 'registration_registration_number', ['full_number'], unique=False)
+    op.create_index('idx_reg_number_full_number_trgm', 'registration_registration_number', ['full_number'], unique=False, postgresql_using='gin', postgresql_ops={'full_number': 'gin_trgm_ops'})
+    op.create_index('idx_corr_reg_external_number', 'correspondence_document_registration', ['external_registration_number'], unique=False)
+    op.create_index('idx_corr_reg_external_number_trgm', 'correspondence_document_registration', ['external_registration_number'], unique=False, postgresql_using='gin', postgresql_ops={'external_registration_number': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_corr_reg_external_number_trgm', table_name='correspondence_document_registration', postgresql_using='gin', postgresql_ops={'external_registration_number': 'gin_trgm_ops'})
+    op.drop_index('idx_corr_reg_external_number', table_name='correspondence_document_registration')
+    op.drop_index('idx_reg_number_full_number_trgm', table_name='registration_registration_number', postgresql_using='gin', postgresql_ops={'full_number': 'gin_trgm_ops'})
+    op.drop_index('idx_reg_number_full_number', table_name='registration_registration_number')
+    op.drop_column('registration_registration_number', 'full_number')
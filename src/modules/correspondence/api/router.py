@@ -1,21 +1,27 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Form
+from fastapi import APIRouter, Depends, Form, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.adapters.http.user_client import User
 from src.core.auth import get_current_user
-from src.core.db import get_session
+from src.core.db_routing import get_read_session, get_write_session
 from src.modules.correspondence.actions.system_registration_document import (
     SystemRegistrationDocumentAction,
 )
 from src.modules.correspondence.api.schemas.document_create_request import (
     DocumentCreateRequest,
 )
+from src.modules.correspondence.api.schemas.registration_number import (
+    RegistrationNumberMatch,
+)
 from src.modules.correspondence.domain.enums.document_type import (
     DocumentTypesRequestEnum,
     DocumentTypeEnum,
 )
+from src.modules.correspondence.domain.enums.registration_number import (
+    RegistrationNumberKindEnum,
+)
 from src.modules.correspondence.domain.models import Document
 from src.modules.correspondence.services.document_create.address_service import (
     DocumentCreateAddress,
@@ -29,6 +35,9 @@ import uuid
 from src.modules.correspondence.services.document_create.registration_service import (
     RegistrationService,
 )
+from src.modules.correspondence.services.registration_lookup import (
+    RegistrationNumberLookup,
+)
 
 router = APIRouter(prefix="/correspondence", tags=["documents"])
 
@@ -39,7 +48,7 @@ router = APIRouter(prefix="/correspondence", tags=["documents"])
 async def create_new_document(
     data: Annotated[DocumentCreateRequest, Form()],
     document_request_type: DocumentTypesRequestEnum,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_write_session),
     user: User = Depends(get_current_user),
 ):
     """Контракт на создание нового документа"""
@@ -83,3 +92,30 @@ async def create_new_document(
         db.add(document)
 
     return {"system_number": document.system_number}
+
+
+@router.get("/registration-numbers", response_model=list[RegistrationNumberMatch])
+async def find_by_registration_number(
+    number: str = Query(..., min_length=1, max_length=62),
+    kind: RegistrationNumberKindEnum = RegistrationNumberKindEnum.INTERNAL,
+    db: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user),
+):
+    """Видимые пользователю документы с точно таким регистрационным номером"""
+
+    return await RegistrationNumberLookup(db, user.id).exact(kind, number)
+
+
+@router.get(
+    "/registration-numbers/typeahead", response_model=list[RegistrationNumberMatch]
+)
+async def registration_number_typeahead(
+    q: str = Query(..., min_length=2, max_length=62),
+    kind: RegistrationNumberKindEnum = RegistrationNumberKindEnum.INTERNAL,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user),
+):
+    """Подсказки по части регистрационного номера, ближайшие — первыми"""
+
+    return await RegistrationNumberLookup(db, user.id).typeahead(kind, q, limit)
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from pydantic import BaseModel, ConfigDict
+
+from src.modules.correspondence.domain.enums.registration_number import (
+    RegistrationNumberKindEnum,
+)
+
+
+class RegistrationNumberMatch(BaseModel):
+    """Документ, найденный по регистрационному номеру"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    document_id: uuid.UUID
+    kind: RegistrationNumberKindEnum
+    number: str
+    registered_at: Optional[datetime] = None
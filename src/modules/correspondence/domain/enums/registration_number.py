@@ -0,0 +1,10 @@
+from enum import StrEnum
+
+
+class RegistrationNumberKindEnum(StrEnum):
+    """Какой регистрационный номер искать"""
+
+    # собственный номер (prefix-number/postfix)
+    INTERNAL = "internal"
+    # номер отправителя при внешней регистрации
+    EXTERNAL = "external"
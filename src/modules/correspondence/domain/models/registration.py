@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import UUID, ForeignKey, String, DateTime, Index
+from sqlalchemy import UUID, ForeignKey, String, DateTime, Index, Computed
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.common.db.mixins import BasicFieldsMixin
@@ -18,6 +18,14 @@ class RegistrationNumber(Base, BasicFieldsMixin):
     prefix: Mapped[str] = mapped_column(String(20), nullable=True)
     number: Mapped[str] = mapped_column(String(20))
     postfix: Mapped[str] = mapped_column(String(20), nullable=True)
+    # «prefix-number/postfix» для поиска; вычисляется и индексируется в БД
+    full_number: Mapped[str] = mapped_column(
+        String(62),
+        Computed(
+            "coalesce(prefix, '') || '-' || number || '/' || coalesce(postfix, '')",
+            persisted=True,
+        ),
+    )
 
     registrator: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
 
@@ -27,12 +35,21 @@ class RegistrationNumber(Base, BasicFieldsMixin):
 
     @property
     def full_name(self) -> str:
-        return f"{self.prefix}-{self.number}/{self.postfix}"
+        # тот же номер, по которому ищут: без «None» при пустых частях
+        return self.full_number
 
     __table_args__ = (
         Index("idx_reg_number_prefix_number", "prefix", "number"),
         Index("idx_reg_number_number_postfix", "number", "postfix"),
         Index("idx_reg_number_full", "prefix", "number", "postfix"),
+        # точный поиск и подсказки по частичному совпадению (pg_trgm)
+        Index("idx_reg_number_full_number", "full_number"),
+        Index(
+            "idx_reg_number_full_number_trgm",
+            "full_number",
+            postgresql_using="gin",
+            postgresql_ops={"full_number": "gin_trgm_ops"},
+        ),
     )
 
 
@@ -40,6 +57,15 @@ class DocumentRegistration(Base, BasicFieldsMixin, RefDocumentMixin):
     """Регистрационные данные документа"""
 
     __tablename__ = "correspondence_document_registration"
+    __table_args__ = (
+        Index("idx_corr_reg_external_number", "external_registration_number"),
+        Index(
+            "idx_corr_reg_external_number_trgm",
+            "external_registration_number",
+            postgresql_using="gin",
+            postgresql_ops={"external_registration_number": "gin_trgm_ops"},
+        ),
+    )
     __document_backref__ = "registration"
     __document_backref_kwargs__ = {
         "cascade": "all, delete-orphan",
@@ -0,0 +1,119 @@
+import uuid
+from functools import cache
+
+from sqlalchemy import (
+    UUID,
+    Select,
+    bindparam,
+    func,
+    literal,
+    or_,
+    select,
+    String,
+    Integer,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.common.db.utils import escape_like
+from src.modules.correspondence.api.schemas.registration_number import (
+    RegistrationNumberMatch,
+)
+from src.modules.correspondence.domain.enums.registration_number import (
+    RegistrationNumberKindEnum,
+)
+from src.modules.correspondence.domain.models import (
+    Document,
+    DocumentAddress,
+    DocumentRegistration,
+)
+from src.modules.correspondence.domain.models.registration import RegistrationNumber
+
+NUMBER = bindparam("number", type_=String)
+PATTERN = bindparam("pattern", type_=String)
+LIMIT = bindparam("limit", type_=Integer)
+USER_ID = bindparam("user_id", type_=UUID(as_uuid=True))
+
+
+def _visible(query: Select) -> Select:
+    """Только документы, которые пользователь создал или где он адресат"""
+    addressed = select(DocumentAddress.document_id).where(
+        DocumentAddress.user_id == USER_ID
+    )
+    return query.join(Document, Document.id == DocumentRegistration.document_id).where(
+        or_(
+            Document.creator_id == USER_ID,
+            DocumentRegistration.document_id.in_(addressed),
+        )
+    )
+
+
+@cache
+def _numbers(kind: RegistrationNumberKindEnum) -> tuple[Select, object]:
+    """Запрос (document_id, kind, number, registered_at) и колонка номера"""
+    if kind == RegistrationNumberKindEnum.INTERNAL:
+        column = RegistrationNumber.full_number
+        query = select(
+            DocumentRegistration.document_id,
+            literal(kind.value).label("kind"),
+            column.label("number"),
+            RegistrationNumber.created_at.label("registered_at"),
+        ).join(
+            RegistrationNumber,
+            RegistrationNumber.id == DocumentRegistration.registration_number_id,
+        )
+    else:
+        column = DocumentRegistration.external_registration_number
+        query = select(
+            DocumentRegistration.document_id,
+            literal(kind.value).label("kind"),
+            column.label("number"),
+            DocumentRegistration.external_registration_at.label("registered_at"),
+        )
+    return _visible(query), column
+
+
+@cache
+def _exact_statement(kind: RegistrationNumberKindEnum) -> Select:
+    query, column = _numbers(kind)
+    return query.where(column == NUMBER)
+
+
+@cache
+def _typeahead_statement(kind: RegistrationNumberKindEnum) -> Select:
+    # ILIKE '%...%' обслуживается GIN-индексом gin_trgm_ops
+    query, column = _numbers(kind)
+    return (
+        query.where(column.ilike(PATTERN, escape="\\"))
+        .order_by(func.similarity(column, NUMBER).desc(), column)
+        .limit(LIMIT)
+    )
+
+
+class RegistrationNumberLookup:
+    """Поиск документов по собственному или внешнему регистрационному номеру"""
+
+    def __init__(self, db: AsyncSession, user_id: uuid.UUID):
+        self.db = db
+        self.user_id = user_id
+
+    async def exact(
+        self, kind: RegistrationNumberKindEnum, number: str
+    ) -> list[RegistrationNumberMatch]:
+        result = await self.db.execute(
+            _exact_statement(kind), {"number": number, "user_id": self.user_id}
+        )
+        return [RegistrationNumberMatch.model_validate(row) for row in result]
+
+    async def typeahead(
+        self, kind: RegistrationNumberKindEnum, q: str, limit: int
+    ) -> list[RegistrationNumberMatch]:
+        result = await self.db.execute(
+            _typeahead_statement(kind),
+            {
+                "number": q,
+                "pattern": f"%{escape_like(q)}%",
+                "limit": limit,
+                "user_id": self.user_id,
+            },
+        )
+        return [RegistrationNumberMatch.model_validate(row) for row in result]
@@ -0,0 +1,88 @@
+import random
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from src.common.enum.user_roles import UserRolesEnum
+from src.stubs.settings import Directory
+
+_LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов"]
+_FIRST_NAMES = ["Иван", "Пётр", "Алексей", "Сергей", "Андрей", "Дмитрий"]
+_MIDDLE_NAMES = ["Иванович", "Петрович", "Сергеевич", "Андреевич", None]
+_DEPARTMENTS = ["Канцелярия", "Юридический отдел", "Бухгалтерия", "ИТ"]
+_JOB_TITLES = ["Специалист", "Ведущий специалист", "Начальник отдела"]
+_PRIVACY_ROLES = [
+    "VSM_DOCFLOW_PRIVACY_LEVEL_OFFICIAL_USE_ONLY",
+    "VSM_DOCFLOW_PRIVACY_LEVEL_CONFIDENTIAL",
+]
+
+
+class SyntheticDirectory:
+    """Детерминированный (по SEED) справочник пользователей и организаций"""
+
+    def __init__(self, config: Directory):
+        rnd = random.Random(config.SEED)
+
+        def _id() -> str:
+            return str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+
+        self.organizations: dict[str, dict] = {}
+        for i in range(config.ORGANIZATIONS):
+            org_id = _id()
+            self.organizations[org_id] = {
+                "id": org_id,
+                "name": f"ООО «Организация {i + 1}»",
+                "is_active": rnd.random() > 0.05,
+                "inn_number": f"{rnd.randrange(10**9, 10**10)}",
+                "kpp_number": f"{rnd.randrange(10**8, 10**9)}",
+            }
+
+        self.users: dict[str, dict] = {}
+        for i in range(config.USERS):
+            user_id = _id()
+            last, first = rnd.choice(_LAST_NAMES), rnd.choice(_FIRST_NAMES)
+            roles = [UserRolesEnum.ROLE_VSM_DOCFLOW_BASIC.value]
+            if i < config.REGISTRATORS:
+                roles.append(UserRolesEnum.ROLE_VSM_DOCFLOW_REGISTRATOR.value)
+            roles += rnd.sample(_PRIVACY_ROLES, k=rnd.randint(0, len(_PRIVACY_ROLES)))
+            self.users[user_id] = {
+                "id": user_id,
+                "avatar": None,
+                "status_text": "",
+                "department": rnd.choice(_DEPARTMENTS),
+                "email": f"user{i}@example.com",
+                "username": f"user{i}",
+                "full_name": f"{last} {first}",
+                "job_title": rnd.choice(_JOB_TITLES),
+                "roles": roles,
+            }
+
+        org_ids = list(self.organizations)
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.external_users: dict[str, dict] = {}
+        for i in range(config.EXTERNAL_USERS):
+            ext_id = _id()
+            orgs = rnd.sample(org_ids, k=min(len(org_ids), rnd.randint(1, 2)))
+            self.external_users[ext_id] = {
+                "id": ext_id,
+                "first_name": rnd.choice(_FIRST_NAMES),
+                "last_name": rnd.choice(_LAST_NAMES),
+                "middle_name": rnd.choice(_MIDDLE_NAMES),
+                "is_active": True,
+                "created_at": (created + timedelta(days=i)).isoformat(),
+                "role": "CONTACT",
+                "organizations": [
+                    {"id": o, "name": self.organizations[o]["name"]} for o in orgs
+                ],
+            }
+
+        self._user_ids = list(self.users)
+
+    def user_for_session(self, session_id: str) -> dict:
+        """Сессия детерминированно отображается на пользователя справочника"""
+        # crc32, а не hash(): hash строк солится в каждом процессе
+        index = zlib.crc32(session_id.encode()) % len(self._user_ids)
+        return self.users[self._user_ids[index]]
+
+    def users_by_role(self, role: str) -> list[str]:
+        return [u["id"] for u in self.users.values() if role in u["roles"]]
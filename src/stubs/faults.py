@@ -0,0 +1,51 @@
+import asyncio
+import math
+import random
+
+from fastapi import APIRouter, HTTPException
+
+from src.stubs.settings import Faults
+
+# z-оценка 99-го перцентиля нормального распределения
+_Z99 = 2.326
+
+
+class FaultInjector:
+    """Подмешивает в ответы задержку, ошибки и зависания"""
+
+    def __init__(self, faults: Faults):
+        self.faults = faults
+
+    def latency_s(self) -> float:
+        median = max(self.faults.LATENCY_MEDIAN_MS, 0.0)
+        if median == 0:
+            return 0.0
+        p99 = max(self.faults.LATENCY_P99_MS, median)
+        sigma = math.log(p99 / median) / _Z99
+        return random.lognormvariate(math.log(median), sigma) / 1000
+
+    async def __call__(self) -> None:
+        """Зависимость FastAPI для эндпоинтов заглушки"""
+        if random.random() < self.faults.TIMEOUT_RATE:
+            await asyncio.sleep(self.faults.TIMEOUT_S)
+        await asyncio.sleep(self.latency_s())
+        if random.random() < self.faults.ERROR_RATE:
+            raise HTTPException(
+                status_code=self.faults.ERROR_STATUS, detail="Injected fault"
+            )
+
+
+def control_router(injector: FaultInjector) -> APIRouter:
+    """Управление отказами на лету, без перезапуска заглушки"""
+    router = APIRouter(prefix="/_control", tags=["control"])
+
+    @router.get("/faults", response_model=Faults)
+    async def get_faults():
+        return injector.faults
+
+    @router.put("/faults", response_model=Faults)
+    async def set_faults(faults: Faults):
+        injector.faults = faults
+        return faults
+
+    return router
@@ -0,0 +1,58 @@
+"""
+Заглушка файлового сервиса для нагрузочных тестов.
+
+    uvicorn src.stubs.files_service:app --port 8002
+    SERVICES__FILES_SERVICE_URL=http://localhost:8002
+
+Файлы хранятся во временной директории (или STUB_FILES_DIR).
+"""
+
+import tempfile
+import uuid
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, UploadFile
+from fastapi.responses import FileResponse
+
+from src.stubs.faults import FaultInjector, control_router
+from src.stubs.settings import StubSettings
+
+CHUNK_SIZE = 64 * 1024
+
+settings = StubSettings()
+faults = FaultInjector(settings.faults)
+storage = Path(settings.FILES_DIR or tempfile.mkdtemp(prefix="files-stub-"))
+storage.mkdir(parents=True, exist_ok=True)
+
+app = FastAPI(title="files-service stub")
+# сбои только на маршрутах сервиса: /_control должен отвечать всегда
+router = APIRouter(dependencies=[Depends(faults)])
+
+
+@router.post("/files")
+async def upload_file(file: UploadFile):
+    file_id = uuid.uuid4()
+    size = 0
+    with open(storage / str(file_id), "wb") as out:
+        while chunk := await file.read(CHUNK_SIZE):
+            out.write(chunk)
+            size += len(chunk)
+    (storage / f"{file_id}.name").write_text(file.filename or str(file_id))
+    return {
+        "id": file_id,
+        "name": file.filename,
+        "size": size,
+        "extension": Path(file.filename or "").suffix.lstrip(".").lower(),
+    }
+
+
+@router.get("/files/{file_id}")
+async def download_file(file_id: uuid.UUID):
+    path = storage / str(file_id)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Файл не найден")
+    return FileResponse(path, filename=(storage / f"{file_id}.name").read_text())
+
+
+app.include_router(router)
+app.include_router(control_router(faults))
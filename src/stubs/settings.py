@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Faults(BaseModel):
+    """Задержки и ошибки, которые подмешиваются в каждый ответ"""
+
+    # задержка — логнормальное распределение по медиане и p99
+    LATENCY_MEDIAN_MS: float = 15.0
+    LATENCY_P99_MS: float = 120.0
+    ERROR_RATE: float = 0.0
+    ERROR_STATUS: int = 503
+    TIMEOUT_RATE: float = 0.0
+    TIMEOUT_S: float = 30.0
+
+
+class Directory(BaseModel):
+    """Размер синтетического справочника"""
+
+    SEED: int = 42
+    USERS: int = 1000
+    ORGANIZATIONS: int = 200
+    EXTERNAL_USERS: int = 500
+    REGISTRATORS: int = 5
+
+
+class StubSettings(BaseSettings):
+    """Настройки заглушек внешних сервисов (префикс STUB_)"""
+
+    model_config = SettingsConfigDict(
+        env_prefix="STUB_",
+        env_file=".env",
+        env_nested_delimiter="__",
+        extra="ignore",
+    )
+
+    faults: Faults = Faults()
+    directory: Directory = Directory()
+    FILES_DIR: str | None = None
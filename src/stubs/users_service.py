@@ -0,0 +1,92 @@
+"""
+Заглушка сервиса пользователей для нагрузочных тестов.
+
+    uvicorn src.stubs.users_service:app --port 8001
+    SERVICES__USERS_SERVICE_URL=http://localhost:8001
+
+Любое непустое значение cookie SESSION считается валидной сессией.
+"""
+
+from typing import List
+
+from fastapi import APIRouter, Cookie, Depends, FastAPI, HTTPException
+from pydantic import BaseModel
+
+from src.stubs.directory import SyntheticDirectory
+from src.stubs.faults import FaultInjector, control_router
+from src.stubs.settings import StubSettings
+
+settings = StubSettings()
+directory = SyntheticDirectory(settings.directory)
+faults = FaultInjector(settings.faults)
+
+app = FastAPI(title="users-service stub")
+# сбои только на маршрутах сервиса: /_control должен отвечать всегда
+router = APIRouter(dependencies=[Depends(faults)])
+
+
+class IdsRequest(BaseModel):
+    ids: List[str] = []
+
+
+class RoleRequest(BaseModel):
+    role: str
+
+
+def _require_session(session: str | None) -> str:
+    if not session:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return session
+
+
+@router.get("/current-user-info")
+async def current_user_info(SESSION: str | None = Cookie(default=None)):
+    return directory.user_for_session(_require_session(SESSION))
+
+
+@router.post("/event-users-info")
+async def event_users_info(
+    data: IdsRequest, SESSION: str | None = Cookie(default=None)
+):
+    _require_session(SESSION)
+    return [directory.users[i] for i in data.ids if i in directory.users]
+
+
+@router.post("/event-organizations-info")
+async def event_organizations_info(
+    data: IdsRequest, SESSION: str | None = Cookie(default=None)
+):
+    _require_session(SESSION)
+    return [
+        directory.organizations[i] for i in data.ids if i in directory.organizations
+    ]
+
+
+@router.post("/event-external-users-info")
+async def event_external_users_info(
+    data: IdsRequest, SESSION: str | None = Cookie(default=None)
+):
+    _require_session(SESSION)
+    return [
+        directory.external_users[i] for i in data.ids if i in directory.external_users
+    ]
+
+
+@router.post("/users-by-role")
+async def users_by_role(data: RoleRequest, SESSION: str | None = Cookie(default=None)):
+    _require_session(SESSION)
+    return directory.users_by_role(data.role)
+
+
+@app.get("/_control/directory")
+async def directory_sample(limit: int = 10):
+    """ID из справочника — для генерации нагрузки"""
+    return {
+        "users": list(directory.users)[:limit],
+        "organizations": list(directory.organizations)[:limit],
+        "external_users": list(directory.external_users)[:limit],
+    }
+
+
+app.include_router(router)
+app.include_router(control_router(faults))
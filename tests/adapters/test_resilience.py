@@ -0,0 +1,51 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.adapters.http.resilience import BreakerState, ResilientCaller
+from src.core.settings import get_settings
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+def answering(status_code: int):
+    calls = []
+
+    async def send() -> httpx.Response:
+        calls.append(status_code)
+        return httpx.Response(status_code)
+
+    return send, calls
+
+
+async def test_server_errors_open_the_breaker():
+    caller = ResilientCaller("users")
+    send, calls = answering(500)
+    threshold = get_settings().http_client.BREAKER_FAILURE_THRESHOLD
+
+    for _ in range(threshold):
+        assert (await caller.call(send)).status_code == 500
+
+    assert caller.breaker.state == BreakerState.OPEN
+    # 500 не повторяется: по одному запросу на вызов
+    assert len(calls) == threshold
+    with pytest.raises(HTTPException) as rejected:
+        await caller.call(send)
+    assert rejected.value.status_code == 503
+    assert len(calls) == threshold
+
+
+async def test_client_errors_keep_the_breaker_closed():
+    caller = ResilientCaller("users")
+    send, _ = answering(404)
+
+    for _ in range(get_settings().http_client.BREAKER_FAILURE_THRESHOLD + 1):
+        assert (await caller.call(send)).status_code == 404
+
+    assert caller.breaker.state == BreakerState.CLOSED
+    assert caller.counters.failures == 0
@@ -0,0 +1,11 @@
+import os
+
+# обязательные параметры БД, чтобы Settings собирался без .env;
+# тесты с настоящей базой берут адрес из TEST_DATABASE_URL
+for name, value in {
+    "DB__POSTGRES_SERVER": "localhost",
+    "DB__POSTGRES_DB": "docflow_test",
+    "DB__POSTGRES_USER": "docflow",
+    "DB__POSTGRES_PASSWORD": "docflow",
+}.items():
+    os.environ.setdefault(name, value)
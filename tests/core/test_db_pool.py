@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.util import greenlet_spawn
+
+from src.core.db_pool import instrumented_pool_class, pool_stats, track_connects
+
+
+def test_engine_pool_reports_stats():
+    # импорт собирает engine с инструментированным пулом
+    from src.core.db import engine
+
+    stats = pool_stats(engine.pool)
+
+    assert stats["connections_created"] == 0
+    assert stats["checked_out"] == 0
+    assert stats["size"] == engine.pool.size()
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_connects_are_counted_across_recreate():
+    pool = instrumented_pool_class("test")(creator=MagicMock)
+    track_connects(pool)
+
+    def connect_twice():
+        pool.connect().close()
+        # так engine.dispose() заменяет пул
+        recreated = pool.recreate()
+        recreated.connect().close()
+        return recreated
+
+    # как в AsyncEngine: синхронный пул работает внутри greenlet
+    recreated = await greenlet_spawn(connect_twice)
+
+    stats = pool_stats(recreated)
+    assert stats["connections_created"] == 2
+    assert stats["checkouts"] == 2
@@ -0,0 +1,50 @@
+import pytest
+
+from src.adapters.http.user_client import UserClient
+from src.core import settings as settings_module
+from src.core.settings import get_settings, reload_settings
+
+
+@pytest.fixture
+def constructions(monkeypatch) -> list:
+    """Считает сборки Settings; снимок на время теста сбрасывается"""
+    calls = []
+
+    class CountingSettings(settings_module.Settings):
+        def __init__(self, **values):
+            calls.append(1)
+            super().__init__(**values)
+
+    monkeypatch.setattr(settings_module, "Settings", CountingSettings)
+    monkeypatch.setattr(settings_module, "_settings", None)
+    return calls
+
+
+def test_snapshot_is_built_once(constructions):
+    first = get_settings()
+    second = get_settings()
+
+    assert first is second
+    assert len(constructions) == 1
+
+
+def test_request_does_not_reparse_configuration(constructions):
+    snapshot = get_settings()
+    # как в запросе: несколько клиентов на один запрос
+    clients = [UserClient(session_id="a"), UserClient(session_id="b")]
+
+    assert all(client.settings is snapshot for client in clients)
+    assert len(constructions) == 1
+
+
+def test_reload_swaps_snapshot(constructions, monkeypatch):
+    old = get_settings()
+    monkeypatch.setenv("SERVICE_NAME", "reloaded")
+
+    new = reload_settings()
+
+    assert new is not old
+    assert get_settings() is new
+    assert new.SERVICE_NAME == "reloaded"
+    assert old.SERVICE_NAME != "reloaded"
+    assert len(constructions) == 2
@@ -0,0 +1,123 @@
+"""
+Черновой модуль (src/draft/V3) написан под пути src.modules.*: на время
+тестов его пакеты подключаются под этими именами.
+
+Тесты с базой требуют PostgreSQL и пропускаются без TEST_DATABASE_URL
+(postgresql+asyncpg://...); схема пересоздаётся на каждый тест.
+"""
+
+import importlib.abc
+import importlib.util
+import os
+import sys
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+DRAFT_PACKAGES = ("documents", "workflow", "registration")
+
+
+class DraftFinder(importlib.abc.MetaPathFinder):
+    """src.modules.<package> -> src/draft/V3/<package>"""
+
+    def find_spec(self, name, path, target=None):
+        parts = name.split(".")
+        if parts[:2] != ["src", "modules"] or len(parts) < 3:
+            return None
+        if parts[2] not in DRAFT_PACKAGES:
+            return None
+        spec = importlib.util.find_spec(".".join(["src", "draft", "V3", *parts[2:]]))
+        if spec is None:
+            return None
+        return importlib.util.spec_from_file_location(
+            name,
+            spec.origin,
+            submodule_search_locations=spec.submodule_search_locations,
+        )
+
+
+sys.meta_path.insert(0, DraftFinder())
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.adapters.http.directory_cache import directory_cache  # noqa: E402
+from src.adapters.http.user_client import User  # noqa: E402
+from src.core.auth import get_current_user  # noqa: E402
+from src.core.db import Base  # noqa: E402
+from src.core.db_instrumentation import install_query_instrumentation  # noqa: E402
+from src.core.db_routing import get_read_session  # noqa: E402
+
+# все модели и слушатели after_flush черновика
+import src.modules.documents.queries  # noqa: E402, F401
+import src.modules.registration.models  # noqa: E402, F401
+import src.modules.workflow.models  # noqa: E402, F401
+from src.modules.documents.routers import router  # noqa: E402
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL не задан")
+    engine = create_async_engine(TEST_DATABASE_URL)
+    install_query_instrumentation(engine)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine) -> async_sessionmaker[AsyncSession]:
+    # как SessionLocal в src.core.db
+    return async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+
+@pytest.fixture
+def user() -> User:
+    return User(
+        id=uuid.uuid4(),
+        status_text="",
+        department="Канцелярия",
+        email="user@example.com",
+        username="user",
+        full_name="Иванов Иван Иванович",
+        job_title="Специалист",
+        roles=["VSM_DOCFLOW_BASIC"],
+    )
+
+
+@pytest.fixture
+async def client(session_factory, user, monkeypatch):
+    async def read_session():
+        async with session_factory() as session:
+            yield session
+
+    async def empty_context(*args, **kwargs) -> dict:
+        return {"users": {}, "organizations": {}, "external_users": {}}
+
+    # сервис пользователей в тесте не нужен
+    monkeypatch.setattr(directory_cache, "build_context", empty_context)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_read_session] = read_session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
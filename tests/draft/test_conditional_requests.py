@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+
+from src.modules.documents.enums import DocumentTypeEnum
+from src.modules.documents.models import Document, DocumentFiles
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def document(session_factory, user) -> Document:
+    async with session_factory() as db, db.begin():
+        doc = Document(
+            document_type=DocumentTypeEnum.INCOMING,
+            content="Письмо",
+            paper_count=1,
+            creator_id=user.id,
+        )
+        db.add(doc)
+    return doc
+
+
+def detail_url(document_id: uuid.UUID) -> str:
+    return f"/correspondence/{document_id}/detail"
+
+
+async def test_detail_answers_304_on_matching_etag(client, document):
+    first = await client.get(detail_url(document.id))
+    etag = first.headers["etag"]
+
+    again = await client.get(detail_url(document.id), headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+
+@pytest.mark.parametrize("if_none_match", [None, 'W/"1-x"'])
+async def test_detail_of_missing_document_is_404(client, if_none_match):
+    headers = {"If-None-Match": if_none_match} if if_none_match else {}
+
+    response = await client.get(detail_url(uuid.uuid4()), headers=headers)
+
+    assert response.status_code == 404
+
+
+async def test_child_row_change_bumps_version(client, session_factory, document):
+    etag = (await client.get(detail_url(document.id))).headers["etag"]
+
+    async with session_factory() as db, db.begin():
+        db.add(
+            DocumentFiles(
+                document_id=document.id,
+                file_id=uuid.uuid4(),
+                name="Приложение.pdf",
+                extension="pdf",
+            )
+        )
+
+    response = await client.get(
+        detail_url(document.id), headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_get_list_is_conditional(client, document):
+    first = await client.get("/correspondence/list")
+    etag = first.headers["etag"]
+
+    again = await client.get("/correspondence/list", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+
+
+async def test_post_list_never_answers_304(client, document):
+    etag = (await client.get("/correspondence/list")).headers["etag"]
+
+    response = await client.post(
+        "/correspondence/list", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert [item["id"] for item in response.json()["data"]] == [str(document.id)]
@@ -0,0 +1,110 @@
+from uuid import uuid4
+
+import pytest
+
+from src.common.db.testing import assert_max_queries
+from src.modules.documents.enums import (
+    DocumentConfidentialTypeEnum,
+    DocumentPartyTypeEnum,
+    DocumentTypeEnum,
+)
+from src.modules.documents.models import (
+    Document,
+    DocumentAddress,
+    DocumentConfidential,
+    DocumentFiles,
+    DocumentRegistration,
+)
+from src.modules.registration.models import RegistrationNumber
+
+pytestmark = pytest.mark.anyio
+
+# count + страница документов + адресаты + уровни секретности + файлы
+LIST_QUERY_BUDGET = 5
+OFFICIAL_USE_ONLY = (
+    DocumentConfidentialTypeEnum.DOCUMENT_PRIVACY_LEVEL_OFFICIAL_USE_ONLY
+)
+
+
+@pytest.fixture
+async def documents(session_factory, user) -> list[Document]:
+    docs = []
+    async with session_factory() as db, db.begin():
+        for i in range(3):
+            doc = Document(
+                document_type=DocumentTypeEnum.INCOMING,
+                content=f"Письмо {i}",
+                paper_count=1,
+                creator_id=user.id,
+            )
+            doc.address_parties = [
+                DocumentAddress(
+                    party_type=DocumentPartyTypeEnum.RECIPIENT, user_id=user.id
+                )
+            ]
+            doc.confidentials = [DocumentConfidential(confidential=OFFICIAL_USE_ONLY)]
+            doc.files = [
+                DocumentFiles(file_id=doc_file, name="Письмо.pdf", extension="pdf")
+                for doc_file in (uuid4(), uuid4())
+            ]
+            doc.registration = DocumentRegistration(
+                external_registration_number=f"{i}-исх",
+                registration_number=RegistrationNumber(
+                    prefix="ВХ", number=f"{i:06}", postfix="-ДСП"
+                ),
+            )
+            docs.append(doc)
+        db.add_all(docs)
+    return docs
+
+
+@pytest.fixture
+async def registered(session_factory, user) -> dict[str, str]:
+    """Зарегистрированные документы: id -> ожидаемый номер"""
+    numbers = {}
+    async with session_factory() as db, db.begin():
+        for number, postfix, expected in (
+            ("000001", "-ДСП", "ВХ-000001/-ДСП"),
+            # пустой постфикс не превращается в «None»
+            ("000002", None, "ВХ-000002/"),
+        ):
+            doc = Document(
+                document_type=DocumentTypeEnum.INCOMING,
+                content=f"Письмо {number}",
+                paper_count=1,
+                creator_id=user.id,
+            )
+            doc.registration = DocumentRegistration(
+                registration_number=RegistrationNumber(
+                    prefix="ВХ", number=number, postfix=postfix
+                )
+            )
+            db.add(doc)
+            await db.flush()
+            numbers[str(doc.id)] = expected
+    return numbers
+
+
+async def test_list_stays_within_query_budget(client, documents):
+    with assert_max_queries(LIST_QUERY_BUDGET):
+        response = await client.post("/correspondence/list", params={"count": "exact"})
+
+    assert response.status_code == 200
+    page = response.json()
+    assert page["total"] == len(documents)
+    assert {item["id"] for item in page["data"]} == {str(d.id) for d in documents}
+    # связи страницы действительно загружены, а не пусты
+    for item in page["data"]:
+        assert item["registration"]["registration_number"].startswith("ВХ-")
+        assert len(item["file_list"]) + (item["main_file"] is not None) == 2
+
+
+async def test_list_shows_registration_number(client, registered):
+    response = await client.post("/correspondence/list")
+
+    assert response.status_code == 200
+    numbers = {
+        item["id"]: item["registration"]["registration_number"]
+        for item in response.json()["data"]
+    }
+    assert numbers == registered
@@ -0,0 +1,68 @@
+import uuid
+
+import pytest
+
+from src.core.settings import get_settings, reload_settings
+from src.modules.documents.enums import DocumentTypeEnum
+from src.modules.documents.models import Document, DocumentRegistration
+from src.modules.registration.models import RegistrationNumber
+
+pytestmark = pytest.mark.anyio
+
+
+def make_document(creator_id: uuid.UUID, number: str) -> Document:
+    doc = Document(
+        document_type=DocumentTypeEnum.INCOMING,
+        content="Договор поставки оборудования",
+        paper_count=1,
+        creator_id=creator_id,
+    )
+    doc.registration = DocumentRegistration(
+        registration_number=RegistrationNumber(prefix="ВХ", number=number)
+    )
+    return doc
+
+
+@pytest.fixture
+async def documents(session_factory, user) -> tuple[Document, Document]:
+    """Свой документ и чужой, одинаково подходящие под любой запрос"""
+    own = make_document(user.id, "000001")
+    foreign = make_document(uuid.uuid4(), "000002")
+    async with session_factory() as db, db.begin():
+        db.add_all([own, foreign])
+    return own, foreign
+
+
+@pytest.mark.parametrize(
+    "q",
+    [
+        pytest.param("догов", id="content"),
+        pytest.param("000", id="number"),
+        pytest.param("вход", id="type"),
+    ],
+)
+async def test_select_returns_only_visible_documents(client, documents, q):
+    own, _ = documents
+
+    response = await client.get("/correspondence/select", params={"q": q})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [str(own.id)]
+
+
+async def test_limit_cap_follows_settings_reload(client, documents, monkeypatch):
+    cap = get_settings().pagination.TYPEAHEAD_MAX_LIMIT
+    params = {"q": "догов", "limit": cap + 1}
+
+    rejected = await client.get("/correspondence/select", params=params)
+
+    monkeypatch.setenv("PAGINATION__TYPEAHEAD_MAX_LIMIT", str(cap + 1))
+    reload_settings()
+    try:
+        accepted = await client.get("/correspondence/select", params=params)
+    finally:
+        monkeypatch.delenv("PAGINATION__TYPEAHEAD_MAX_LIMIT")
+        reload_settings()
+
+    assert rejected.status_code == 400
+    assert accepted.status_code == 200
@@ -0,0 +1,101 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from src.modules.documents.enums import DocumentTypeEnum
+from src.modules.documents.models import Document
+from src.modules.workflow.actions.workflow_activate_service import (
+    WorkflowActivateService,
+)
+from src.modules.workflow.enums import StatusEnum, StepTypeEnum
+from src.modules.workflow.models import (
+    DocumentUserStatus,
+    Workflow,
+    WorkflowParticipant,
+    WorkflowStep,
+)
+from src.modules.workflow.status import document_status_projector
+
+pytestmark = pytest.mark.anyio
+
+
+def make_document(creator_id: uuid.UUID, participant_id: uuid.UUID) -> Document:
+    # id задаётся явно, как в DocumentCreateService: до flush его ещё нет
+    document = Document(
+        id=uuid.uuid4(),
+        document_type=DocumentTypeEnum.INCOMING,
+        content="Письмо",
+        paper_count=1,
+        creator_id=creator_id,
+    )
+    document.workflow = Workflow(
+        steps=[
+            WorkflowStep(
+                step_type=StepTypeEnum.REGISTRATION,
+                status=StatusEnum.WAITING,
+                order=1,
+                participants=[WorkflowParticipant(user_id=participant_id)],
+            )
+        ]
+    )
+    return document
+
+
+async def statuses(db, document_id: uuid.UUID) -> dict[uuid.UUID, str]:
+    rows = await db.execute(
+        select(DocumentUserStatus.user_id, DocumentUserStatus.status).where(
+            DocumentUserStatus.document_id == document_id
+        )
+    )
+    return dict(rows.all())
+
+
+async def test_created_document_gets_status_rows(session_factory, user):
+    participant_id = uuid.uuid4()
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id, participant_id)
+        db.add(document)
+        # как в DocumentCreateService: без flush перед вызовом
+        await document_status_projector.refresh(db, document.id)
+
+    async with session_factory() as db:
+        # участник неактивного шага статуса ещё не получает
+        assert await statuses(db, document.id) == {user.id: StatusEnum.WAITING}
+
+
+async def test_activation_updates_status_rows(session_factory, user):
+    participant_id = uuid.uuid4()
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id, participant_id)
+        db.add(document)
+        await document_status_projector.refresh(db, document.id)
+
+    async with session_factory() as db, db.begin():
+        await WorkflowActivateService(document_id=document.id, db=db).execute()
+
+    async with session_factory() as db:
+        assert await statuses(db, document.id) == {
+            user.id: StatusEnum.SENDED,
+            participant_id: StatusEnum.SENDED,
+        }
+
+
+async def test_refresh_without_changes_keeps_version(session_factory, user):
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id, uuid.uuid4())
+        db.add(document)
+        await document_status_projector.refresh(db, document.id)
+
+    async def version() -> int:
+        async with session_factory() as db:
+            return await db.scalar(
+                select(Document.version).where(Document.id == document.id)
+            )
+
+    before = await version()
+    async with session_factory() as db, db.begin():
+        await document_status_projector.refresh(db, document.id)
+
+    # ETag карточки у клиентов остаётся действительным
+    assert await version() == before
@@ -0,0 +1,110 @@
+import json
+import uuid
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from src.adapters.http.user_client import Organization
+from src.common.responses import FastJSONResponse
+from src.modules.documents.enums import (
+    DocumentConfidentialTypeEnum,
+    DocumentPartyTypeEnum,
+    DocumentTypeEnum,
+)
+from src.modules.documents.models import (
+    Document,
+    DocumentAddress,
+    DocumentConfidential,
+    DocumentFiles,
+    DocumentRegistration,
+)
+from src.modules.documents.queries import document_list_statement
+from src.modules.documents.schemas.document_list_item import DocumentListItem
+from src.modules.documents.serializers import serialize_document_list_item
+from src.modules.registration.models import RegistrationNumber
+
+pytestmark = pytest.mark.anyio
+
+OFFICIAL_USE_ONLY = (
+    DocumentConfidentialTypeEnum.DOCUMENT_PRIVACY_LEVEL_OFFICIAL_USE_ONLY
+)
+
+
+@pytest.fixture
+def organization() -> Organization:
+    return Organization(
+        id=uuid.uuid4(),
+        name='ООО "Ромашка"',
+        is_active=True,
+        inn_number="7701234567",
+        kpp_number="770101001",
+    )
+
+
+@pytest.fixture
+async def page(session_factory, user, organization) -> list[Document]:
+    """Документ со всеми связями страницы, загруженный как в /list"""
+    async with session_factory() as db, db.begin():
+        doc = Document(
+            document_type=DocumentTypeEnum.INCOMING,
+            content="О согласовании договора",
+            paper_count=3,
+            attachment_description="3 приложения",
+            creator_id=user.id,
+        )
+        doc.registration = DocumentRegistration(
+            external_registration_number="15-исх",
+            registration_number=RegistrationNumber(
+                prefix="ВХ", number="000015", postfix=None, registrator=user.id
+            ),
+        )
+        doc.address_parties = [
+            DocumentAddress(
+                party_type=DocumentPartyTypeEnum.SENDER,
+                organization_id=organization.id,
+            ),
+            DocumentAddress(
+                party_type=DocumentPartyTypeEnum.RECIPIENT, user_id=user.id
+            ),
+        ]
+        doc.confidentials = [DocumentConfidential(confidential=OFFICIAL_USE_ONLY)]
+        doc.files = [
+            DocumentFiles(
+                file_id=uuid.uuid4(),
+                name=name,
+                extension=name.rsplit(".", 1)[1],
+                size=1024,
+                is_main=is_main,
+            )
+            for name, is_main in (("Письмо.pdf", True), ("Приложение.docx", False))
+        ]
+        db.add(doc)
+
+    async with session_factory() as db:
+        result = await db.execute(
+            document_list_statement(),
+            {"current_user_id": user.id, "limit": 15, "offset": 0},
+        )
+        return result.scalars().all()
+
+
+async def test_serializes_rows_loaded_for_the_list(page, user, organization):
+    context = {
+        "users": {str(user.id): user},
+        "organizations": {str(organization.id): organization},
+        "external_users": {},
+    }
+
+    [item] = [serialize_document_list_item(doc, context) for doc in page]
+
+    assert item["registration"]["registration_number"] == "ВХ-000015/"
+    assert item["registration"]["external_registration_number"] == "15-исх"
+    assert item["sender"]["organizations"] == [organization]
+    assert item["recipient"]["users"] == [user]
+    assert item["main_file"]["name"] == "Письмо.pdf"
+    assert [f["name"] for f in item["file_list"]] == ["Приложение.docx"]
+    # тот же ответ, что через DocumentListItem
+    expected = DocumentListItem.model_validate(
+        page[0], from_attributes=True, context=context
+    )
+    assert json.loads(FastJSONResponse(item).body) == jsonable_encoder(expected)
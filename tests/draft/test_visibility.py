@@ -0,0 +1,220 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from src.modules.documents.enums import (
+    DocumentAccessTypeEnum,
+    DocumentPartyTypeEnum,
+    DocumentTypeEnum,
+    DocumentVisibilityReasonEnum as Reason,
+)
+from src.modules.documents.models import (
+    Document,
+    DocumentAccess,
+    DocumentAddress,
+    DocumentVisibility,
+)
+from src.modules.documents.queries import document_count_rows
+from src.modules.documents.visibility import rebuild_visibility
+from src.modules.workflow.enums import StatusEnum, StepTypeEnum
+from src.modules.workflow.models import Workflow, WorkflowParticipant, WorkflowStep
+
+pytestmark = pytest.mark.anyio
+
+
+def make_document(creator_id: uuid.UUID) -> Document:
+    return Document(
+        id=uuid.uuid4(),
+        document_type=DocumentTypeEnum.INCOMING,
+        content="Письмо",
+        paper_count=1,
+        creator_id=creator_id,
+    )
+
+
+def access(user_id: uuid.UUID, expires_at=None) -> DocumentAccess:
+    return DocumentAccess(
+        user_id=user_id,
+        expires_at=expires_at,
+        access_type=DocumentAccessTypeEnum.READONLY,
+    )
+
+
+async def reasons(db, document_id: uuid.UUID) -> dict[uuid.UUID, set[str]]:
+    """Строки видимости документа: пользователь -> причины"""
+    rows = await db.execute(
+        select(DocumentVisibility.user_id, DocumentVisibility.reason).where(
+            DocumentVisibility.document_id == document_id
+        )
+    )
+    result: dict[uuid.UUID, set[str]] = {}
+    for user_id, reason in rows:
+        result.setdefault(user_id, set()).add(reason)
+    return result
+
+
+async def listed(db, user_id: uuid.UUID) -> set[uuid.UUID]:
+    """Документы, которые попадут в список пользователя"""
+    rows = await db.scalars(document_count_rows(), {"current_user_id": user_id})
+    return set(rows)
+
+
+async def test_creator_sees_created_document(session_factory, user):
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id)
+        db.add(document)
+
+    async with session_factory() as db:
+        assert await reasons(db, document.id) == {user.id: {Reason.CREATOR}}
+        assert await listed(db, user.id) == {document.id}
+
+
+async def test_address_added_and_removed(session_factory, user):
+    recipient_id = uuid.uuid4()
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id)
+        address = DocumentAddress(
+            document=document,
+            party_type=DocumentPartyTypeEnum.RECIPIENT,
+            user_id=recipient_id,
+        )
+        db.add_all([document, address])
+
+    async with session_factory() as db, db.begin():
+        assert (await reasons(db, document.id))[recipient_id] == {Reason.ADDRESS}
+        await db.delete(await db.get(DocumentAddress, address.id))
+
+    async with session_factory() as db:
+        assert recipient_id not in await reasons(db, document.id)
+        assert await listed(db, recipient_id) == set()
+
+
+async def test_access_without_expiry(session_factory, user):
+    reader_id = uuid.uuid4()
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id)
+        document.accesses = [access(reader_id)]
+        db.add(document)
+
+    async with session_factory() as db:
+        assert (await reasons(db, document.id))[reader_id] == {Reason.ACCESS}
+        assert await listed(db, reader_id) == {document.id}
+
+
+async def test_expired_access_drops_out_without_recompute(session_factory, user):
+    reader_id = uuid.uuid4()
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id)
+        document.accesses = [access(reader_id, expires_at)]
+        db.add(document)
+
+    async with session_factory() as db, db.begin():
+        assert await listed(db, reader_id) == {document.id}
+        # срок прошёл: исходные таблицы не менялись, пересчёта не было
+        await db.execute(
+            update(DocumentVisibility)
+            .where(DocumentVisibility.user_id == reader_id)
+            .values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+
+    async with session_factory() as db:
+        assert await listed(db, reader_id) == set()
+
+
+async def test_already_expired_access_gives_no_row(session_factory, user):
+    reader_id = uuid.uuid4()
+    expired = datetime.now(timezone.utc) - timedelta(days=1)
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id)
+        document.accesses = [access(reader_id, expired)]
+        db.add(document)
+
+    async with session_factory() as db:
+        assert reader_id not in await reasons(db, document.id)
+
+
+async def test_open_ended_access_outlives_temporary_one(session_factory, user):
+    reader_id = uuid.uuid4()
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id)
+        document.accesses = [access(reader_id, expires_at), access(reader_id)]
+        db.add(document)
+
+    async with session_factory() as db:
+        stored = await db.scalars(
+            select(DocumentVisibility.expires_at).where(
+                DocumentVisibility.user_id == reader_id
+            )
+        )
+        assert stored.all() == [None]
+
+
+async def test_participant_added_and_removed(session_factory, user):
+    participant_id = uuid.uuid4()
+    async with session_factory() as db, db.begin():
+        document = make_document(user.id)
+        step = WorkflowStep(
+            step_type=StepTypeEnum.REGISTRATION, status=StatusEnum.WAITING, order=1
+        )
+        document.workflow = Workflow(steps=[step])
+        db.add(document)
+
+    async with session_factory() as db, db.begin():
+        participant = WorkflowParticipant(
+            workflow_step_id=step.id, user_id=participant_id
+        )
+        db.add(participant)
+
+    async with session_factory() as db, db.begin():
+        assert (await reasons(db, document.id))[participant_id] == {Reason.PARTICIPANT}
+        await db.delete(await db.get(WorkflowParticipant, participant.id))
+
+    async with session_factory() as db:
+        assert participant_id not in await reasons(db, document.id)
+
+
+async def test_rebuild_matches_incremental_rows(session_factory, user):
+    other_id = uuid.uuid4()
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    async with session_factory() as db, db.begin():
+        for i in range(3):
+            document = make_document(user.id if i % 2 else other_id)
+            document.address_parties = [
+                DocumentAddress(
+                    party_type=DocumentPartyTypeEnum.RECIPIENT, user_id=user.id
+                ),
+                DocumentAddress(
+                    party_type=DocumentPartyTypeEnum.SENDER, organization_id=other_id
+                ),
+            ]
+            document.accesses = [access(other_id, expires_at), access(uuid.uuid4())]
+            document.workflow = Workflow(
+                steps=[
+                    WorkflowStep(
+                        step_type=StepTypeEnum.REGISTRATION,
+                        status=StatusEnum.WAITING,
+                        order=1,
+                        participants=[WorkflowParticipant(user_id=other_id)],
+                    )
+                ]
+            )
+            db.add(document)
+
+    snapshot = select(
+        DocumentVisibility.user_id,
+        DocumentVisibility.document_id,
+        DocumentVisibility.reason,
+        DocumentVisibility.created_at,
+        DocumentVisibility.expires_at,
+    )
+    async with session_factory() as db, db.begin():
+        incremental = set((await db.execute(snapshot)).all())
+        await rebuild_visibility(db)
+        rebuilt = set((await db.execute(snapshot)).all())
+
+    assert incremental
+    assert rebuilt == incremental